@@ -0,0 +1,160 @@
+"""Count the filesystem calls made to discover the addons of a directory.
+
+Usage: ``python benchmarks/bench_addons_discovery.py [ADDONS_DIR...]``
+
+Without arguments, a temporary addons directory with synthetic addons is used.
+:meth:`AddonsSet.add_from_addons_dir` is compared with the previous discovery,
+which probed each entry with ``is_dir()`` and ``is_file()``.
+
+The calls are counted with ``strace -c`` when it is available. Otherwise stat calls
+made from Python, file opens and directory listings are counted with an audit hook,
+which ignores the stat calls made by ``os.DirEntry`` for symbolic links.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Counter, List, Tuple
+
+from manifestoo_core.addon import Addon
+from manifestoo_core.addons_set import AddonsSet
+from manifestoo_core.manifest import Manifest, get_manifest_path
+
+ADDONS_COUNT = 500
+
+
+def legacy_discovery(addons_dirs: List[Path]) -> AddonsSet:
+    addons_set = AddonsSet()
+    for addons_dir in addons_dirs:
+        if not addons_dir.is_dir():
+            continue
+        for addon_dir in addons_dir.iterdir():
+            if not addon_dir.is_dir():
+                continue
+            manifest_path = get_manifest_path(addon_dir)
+            if not manifest_path:
+                continue
+            manifest = Manifest.from_file(manifest_path)
+            if not manifest.installable:
+                continue
+            if not addon_dir.joinpath("__init__.py").is_file():
+                continue
+            addons_set[addon_dir.name] = Addon(manifest, manifest_path)
+    return addons_set
+
+
+def scandir_discovery(addons_dirs: List[Path]) -> AddonsSet:
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(addons_dirs)
+    return addons_set
+
+
+DISCOVERIES = {"legacy": legacy_discovery, "scandir": scandir_discovery}
+
+
+def populate(addons_dir: Path) -> None:
+    for i in range(ADDONS_COUNT):
+        addon_dir = addons_dir / f"addon_{i}"
+        addon_dir.mkdir()
+        (addon_dir / "__init__.py").touch()
+        (addon_dir / "__manifest__.py").write_text(
+            repr({"name": f"Addon {i}", "depends": ["base"]})
+        )
+        (addon_dir / "models").mkdir()
+        (addon_dir / "README.rst").touch()
+    (addons_dir / "setup").mkdir()
+    (addons_dir / "README.md").touch()
+
+
+class _AuditCounter:
+    events = ("open", "os.scandir", "os.listdir")
+
+    def __init__(self) -> None:
+        self.counts: Counter[str] = Counter()
+        self.active = False
+        sys.addaudithook(self.hook)
+
+    def hook(self, event: str, args: Tuple[Any, ...]) -> None:
+        if self.active and event in self.events:
+            self.counts[event] += 1
+
+    def count(self, func: Callable[[], object]) -> Counter[str]:
+        os_stat = os.stat
+
+        def counting_stat(*args: Any, **kwargs: Any) -> os.stat_result:
+            if self.active:
+                self.counts["stat"] += 1
+            return os_stat(*args, **kwargs)
+
+        self.counts = Counter()
+        os.stat = counting_stat
+        self.active = True
+        try:
+            func()
+        finally:
+            self.active = False
+            os.stat = os_stat
+        return self.counts
+
+
+def strace_counts(name: str, addons_dirs: List[Path]) -> Counter[str]:
+    with tempfile.NamedTemporaryFile("r") as output:
+        subprocess.run(  # noqa: S603
+            [  # noqa: S607
+                "strace",
+                "-f",
+                "-c",
+                "-o",
+                output.name,
+                sys.executable,
+                __file__,
+                "--run",
+                name,
+                *map(str, addons_dirs),
+            ],
+            check=True,
+        )
+        counts: Counter[str] = Counter()
+        for line in output:
+            fields = line.split()
+            # % time, seconds, usecs/call, calls, [errors], syscall
+            if fields[3:4] and fields[3].isdigit() and fields[-1] != "total":
+                counts[fields[-1]] += int(fields[3])
+    return counts
+
+
+def main() -> None:
+    if sys.argv[1:2] == ["--run"]:
+        # Run a discovery under strace. The calls made by the interpreter startup
+        # are counted too, they are the same for all discoveries.
+        DISCOVERIES[sys.argv[2]]([Path(p) for p in sys.argv[3:]])
+        return
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            addons_dirs = [Path(p) for p in sys.argv[1:]]
+        else:
+            addons_dirs = [Path(tmp_dir)]
+            populate(addons_dirs[0])
+        audit_counter = None if shutil.which("strace") else _AuditCounter()
+        for name, discovery in DISCOVERIES.items():
+            start = time.perf_counter()
+            addons_set = discovery(addons_dirs)
+            elapsed = time.perf_counter() - start
+            if audit_counter is None:
+                counts = strace_counts(name, addons_dirs)
+            else:
+                counts = audit_counter.count(partial(discovery, addons_dirs))
+            details = ", ".join(f"{k}={v}" for k, v in counts.most_common())
+            print(
+                f"{name:>8}: {len(addons_set)} addons, {elapsed * 1000:.1f} ms, "
+                f"{sum(counts.values())} calls ({details})"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Compare the manifest parser engines.
+
+Usage: ``python benchmarks/bench_manifest_parser.py [ADDONS_DIR...]``
+
+Without arguments, synthetic manifests with descriptions of various sizes are used.
+Otherwise the manifests of all addons found in the given addons directories are
+parsed. Each engine is also timed when loading only a few keys.
+"""
+
+import sys
+import timeit
+from pathlib import Path
+from typing import List
+
+from manifestoo_core.manifest import MANIFEST_NAMES
+from manifestoo_core.manifest_parser import ManifestParser, parse_manifest_literal
+
+PARTIAL_KEYS = ("version", "depends", "installable")
+TEMPLATE = """\
+# Copyright 2024 Someone
+# License AGPL-3.0 or later (https://www.gnu.org/licenses/agpl).
+{{
+    "name": "Some Addon",
+    "summary": "Do something useful",
+    "version": "16.0.1.2.3",
+    "license": "AGPL-3",
+    "author": "Someone, Odoo Community Association (OCA)",
+    "website": "https://github.com/OCA/server-tools",
+    "depends": ["base", "mail", "web"],
+    "external_dependencies": {{"python": ["requests"]}},
+    "data": [
+        "security/ir.model.access.csv",
+        "views/some_model_views.xml",
+    ],
+    "description": {description!r},
+    "installable": True,
+}}
+"""
+
+
+def synthetic_sources() -> List[str]:
+    paragraph = "This module does *something*.\n\n.. code-block:: python\n\n  x = 1\n"
+    return [TEMPLATE.format(description=paragraph * n) for n in (0, 10, 100, 1000)]
+
+
+def addons_dir_sources(addons_dirs: List[Path]) -> List[str]:
+    sources = []
+    for addons_dir in addons_dirs:
+        for addon_dir in sorted(addons_dir.iterdir()):
+            for manifest_name in MANIFEST_NAMES:
+                manifest_path = addon_dir / manifest_name
+                if manifest_path.is_file():
+                    sources.append(manifest_path.read_text())
+                    break
+    return sources
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        sources = addons_dir_sources([Path(p) for p in sys.argv[1:]])
+    else:
+        sources = synthetic_sources()
+    total_size = sum(len(s) for s in sources)
+    print(f"{len(sources)} manifests, {total_size} characters")
+    for parser in ManifestParser:
+        for keys in (None, PARTIAL_KEYS):
+            timer = timeit.Timer(
+                lambda parser=parser, keys=keys: [
+                    parse_manifest_literal(s, parser, keys) for s in sources
+                ],
+            )
+            number, _ = timer.autorange()
+            best = min(timer.repeat(repeat=5, number=number)) / number
+            label = parser.value if keys is None else f"{parser.value} (keys)"
+            print(f"{label:>10}: {best * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare the memory used by an addons set, before and after compacting it.
+
+Usage: ``python benchmarks/bench_memory.py [ADDONS_COUNT]``
+
+Synthetic manifests with a description, data files and a few dependencies are
+parsed in memory, and the memory allocated for the addons set is measured with
+:mod:`tracemalloc`, before and after :meth:`AddonsSet.compact`.
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from manifestoo_core.addon import Addon
+from manifestoo_core.addons_set import AddonsSet
+from manifestoo_core.manifest import Manifest
+
+ADDONS_COUNT = 20000
+ADDONS_DIR = Path("/srv/odoo/addons/oca/server-tools")
+
+
+def manifests(count: int) -> List[str]:
+    rng = random.Random(42)  # noqa: S311
+    return [
+        repr(
+            {
+                "name": f"Addon {i}",
+                "version": "16.0.1.0.0",
+                "summary": f"Summary of addon {i}",
+                "description": "A long description of the addon.\n" * 40,
+                "author": "ACSONE SA/NV,Odoo Community Association (OCA)",
+                "website": "https://github.com/OCA/server-tools",
+                "license": "AGPL-3",
+                "category": "Tools",
+                "depends": ["base"]
+                + [f"addon_{rng.randrange(i)}" for _ in range(min(i, 3))],
+                "data": [f"views/view_{k}.xml" for k in range(8)],
+                "installable": True,
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def traced_memory() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ADDONS_COUNT
+    texts = manifests(count)
+    tracemalloc.start()
+    baseline = traced_memory()
+    addons_set = AddonsSet()
+    for i, text in enumerate(texts):
+        manifest_path = ADDONS_DIR / f"addon_{i}" / "__manifest__.py"
+        addons_set[f"addon_{i}"] = Addon(Manifest.from_str(text), manifest_path)
+    full = traced_memory() - baseline
+    print(f"full: {len(addons_set)} addons, {full / 2**20:.1f} MiB")
+    start = time.perf_counter()
+    addons_set.compact()
+    elapsed = time.perf_counter() - start
+    compact = traced_memory() - baseline
+    print(
+        f"compact: {compact / 2**20:.1f} MiB ({compact / full:.0%}), "
+        f"compacted in {elapsed:.3f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure the scaling of addons discovery with the number of worker threads.
+
+Usage: ``python benchmarks/bench_parallel_discovery.py [--latency MS] [ADDONS_DIR...]``
+
+Without addons directories, temporary addons directories with synthetic addons are
+used. ``--latency`` adds a delay to each directory listing and file read, to
+simulate a network filesystem.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List
+
+from manifestoo_core.addons_set import AddonsSet
+
+ADDONS_DIRS_COUNT = 30
+ADDONS_COUNT = 40
+WORKERS = (1, 2, 4, 8, 16, 32)
+
+
+def populate(addons_dirs: List[Path]) -> None:
+    for n, addons_dir in enumerate(addons_dirs):
+        addons_dir.mkdir()
+        for i in range(ADDONS_COUNT):
+            addon_dir = addons_dir / f"addon_{n}_{i}"
+            addon_dir.mkdir()
+            (addon_dir / "__init__.py").touch()
+            (addon_dir / "__manifest__.py").write_text(
+                repr({"name": f"Addon {i}", "depends": ["base"]})
+            )
+
+
+def add_latency(latency: float) -> None:
+    scandir = os.scandir
+    read_text = Path.read_text
+
+    def slow_scandir(*args: Any, **kwargs: Any) -> Any:
+        time.sleep(latency)
+        return scandir(*args, **kwargs)
+
+    def slow_read_text(*args: Any, **kwargs: Any) -> str:
+        time.sleep(latency)
+        return read_text(*args, **kwargs)
+
+    os.scandir = slow_scandir
+    Path.read_text = slow_read_text  # type: ignore[method-assign]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds")
+    parser.add_argument("addons_dirs", nargs="*", type=Path)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        addons_dirs = args.addons_dirs
+        if not addons_dirs:
+            addons_dirs = [
+                Path(tmp_dir) / f"addons_{n}" for n in range(ADDONS_DIRS_COUNT)
+            ]
+            populate(addons_dirs)
+        if args.latency:
+            add_latency(args.latency / 1000)
+        reference = None
+        for workers in WORKERS:
+            addons_set = AddonsSet()
+            start = time.perf_counter()
+            addons_set.add_from_addons_dirs(addons_dirs, workers=workers)
+            elapsed = time.perf_counter() - start
+            paths = [(name, addon.path) for name, addon in addons_set.items()]
+            if reference is None:
+                reference = paths
+            assert paths == reference, "the result depends on the workers"  # noqa: S101
+            print(f"{workers:>3} workers: {len(addons_set)} addons, {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
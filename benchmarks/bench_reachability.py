@@ -0,0 +1,73 @@
+"""Compare dependency queries on a large synthetic dependency graph.
+
+Usage: ``python benchmarks/bench_reachability.py [ADDONS_COUNT]``
+
+The transitive dependencies of all the addons are obtained from a
+:class:`DependencyGraph`, and from a :class:`Reachability` matrix, which is then
+used to test random pairs of addons and to intersect the dependencies of random
+deployments.
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+from manifestoo_core.addon import Addon
+from manifestoo_core.addons_set import AddonsSet
+from manifestoo_core.dependency_graph import DependencyGraph, Reachability
+from manifestoo_core.manifest import Manifest
+
+ADDONS_COUNT = 20000
+MAX_DEPENDS = 4
+QUERIES = 1000000
+DEPLOYMENTS = 1000
+DEPLOYMENT_SIZE = 200
+
+
+def make_addons_set(count: int) -> AddonsSet:
+    rng = random.Random(42)  # noqa: S311
+    addons_set = AddonsSet()
+    for i in range(count):
+        depends = [f"addon_{rng.randrange(i)}" for _ in range(min(i, MAX_DEPENDS))]
+        manifest = Manifest.from_dict({"depends": depends})
+        addons_set[f"addon_{i}"] = Addon(manifest, Path(f"addon_{i}/__manifest__.py"))
+    return addons_set
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else ADDONS_COUNT
+    graph = DependencyGraph(make_addons_set(count))
+    names = list(graph)
+
+    start = time.perf_counter()
+    for name in names:
+        graph.all_depends(name)
+    print(f"all_depends of all addons: {time.perf_counter() - start:.3f} s")
+
+    start = time.perf_counter()
+    reachability = Reachability(graph)
+    print(f"Reachability: {time.perf_counter() - start:.3f} s")
+
+    rng = random.Random(0)  # noqa: S311
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(QUERIES)]
+    start = time.perf_counter()
+    found = sum(reachability.depends_on(name, other) for name, other in pairs)
+    elapsed = time.perf_counter() - start
+    print(f"{QUERIES} depends_on queries ({found} true): {elapsed:.3f} s")
+
+    deployments = [rng.sample(names, DEPLOYMENT_SIZE) for _ in range(DEPLOYMENTS)]
+    start = time.perf_counter()
+    for deployment in deployments:
+        reachability.common_depends(deployment)
+    elapsed = time.perf_counter() - start
+    print(f"{DEPLOYMENTS} common_depends of {DEPLOYMENT_SIZE} addons: {elapsed:.3f} s")
+    start = time.perf_counter()
+    for deployment in deployments:
+        frozenset.intersection(*map(graph.all_depends, deployment))
+    elapsed = time.perf_counter() - start
+    print(f"{DEPLOYMENTS} frozenset intersections: {elapsed:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare rebuilding an addons set with refreshing it, and loading a snapshot.
+
+Usage: ``python benchmarks/bench_refresh.py [ADDONS_DIR...]``
+
+Without arguments, a temporary addons directory with synthetic addons is used.
+
+With 5000 synthetic addons, loading a snapshot takes about 0.11 to 0.17 s, against
+0.5 to 0.6 s for a tracked rebuild. About 30 ms are spent rebuilding the addons,
+30 ms in the revalidation stat calls, and 30 ms in garbage collections triggered
+by the allocations.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from manifestoo_core.addons_set import AddonsSet
+
+ADDONS_COUNT = 5000
+
+
+def populate(addons_dir: Path) -> None:
+    for i in range(ADDONS_COUNT):
+        addon_dir = addons_dir / f"addon_{i}"
+        addon_dir.mkdir()
+        (addon_dir / "__init__.py").touch()
+        (addon_dir / "__manifest__.py").write_text(
+            repr({"name": f"Addon {i}", "depends": ["base"], "version": "1.0"})
+        )
+
+
+def build(addons_dirs: List[Path], track_changes: bool) -> AddonsSet:
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(addons_dirs, track_changes=track_changes)
+    return addons_set
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if len(sys.argv) > 1:
+            addons_dirs = [Path(p) for p in sys.argv[1:]]
+        else:
+            addons_dirs = [Path(tmp_dir)]
+            populate(addons_dirs[0])
+        start = time.perf_counter()
+        addons_set = build(addons_dirs, track_changes=False)
+        elapsed = time.perf_counter() - start
+        print(f"rebuild: {len(addons_set)} addons, {elapsed:.4f} s")
+        start = time.perf_counter()
+        changes = addons_set.refresh()
+        print(
+            f"untracked no-op refresh: {changes}, {time.perf_counter() - start:.4f} s"
+        )
+        start = time.perf_counter()
+        addons_set = build(addons_dirs, track_changes=True)
+        elapsed = time.perf_counter() - start
+        print(f"tracked rebuild: {len(addons_set)} addons, {elapsed:.4f} s")
+        start = time.perf_counter()
+        changes = addons_set.refresh()
+        print(f"no-op refresh: {changes}, {time.perf_counter() - start:.4f} s")
+        addon = next(iter(addons_set.values()))
+        addon.manifest_path.write_text(addon.manifest_path.read_text() + "\n")
+        start = time.perf_counter()
+        changes = addons_set.refresh()
+        print(f"refresh: {changes}, {time.perf_counter() - start:.4f} s")
+        with tempfile.TemporaryDirectory() as snapshot_dir:
+            snapshot = Path(snapshot_dir) / "snapshot"
+            start = time.perf_counter()
+            addons_set.save(snapshot)
+            elapsed = time.perf_counter() - start
+            size = snapshot.stat().st_size
+            print(f"save snapshot: {size} bytes, {elapsed:.4f} s")
+            start = time.perf_counter()
+            addons_set = AddonsSet.load(snapshot)
+            elapsed = time.perf_counter() - start
+            print(f"load snapshot: {len(addons_set)} addons, {elapsed:.4f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import errno
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
 from pathlib import Path
-from typing import Optional
+from typing import Collection, Dict, Iterable, NamedTuple, Optional, Tuple, Type, Union
 
 from .exceptions import (
     AddonNotFound,
@@ -9,20 +15,130 @@ from .exceptions import (
     AddonNotFoundNotADirectory,
     AddonNotFoundNotInstallable,
 )
-from .manifest import InvalidManifest, Manifest, get_manifest_path
+from .manifest import MANIFEST_NAMES, InvalidManifest, Manifest, get_manifest_path
+from .manifest_cache import StatSignature, stat_signature
 
 __all__ = [
     "Addon",
+    "AddonCache",
+    "AddonDirStatus",
+    "CacheInfo",
+    "get_addon_cache",
     "is_addon_dir",
+    "probe_addon_dir",
+    "probe_addon_dirs",
+    "set_addon_cache",
 ]
 
 
+# Errors of os.scandir() for which Path.is_dir() returns False.
+_NOT_A_DIRECTORY_ERRNOS = (errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP)
+
+
+def _list_addon_dir(addon_dir: Path) -> Optional[Tuple[Optional[Path], bool]]:
+    """List an addon directory to find its manifest file and ``__init__.py``.
+
+    Return the manifest path, or None, and whether ``__init__.py`` exists, or None
+    if ``addon_dir`` is not a directory. The type of the entries is obtained from
+    the directory listing when the platform provides it, so no file is stat'ed
+    except symbolic links.
+    """
+    manifest_paths: Dict[str, Path] = {}
+    has_init = False
+    try:
+        with os.scandir(addon_dir) as entries:
+            for entry in entries:
+                if entry.name in MANIFEST_NAMES:
+                    if entry.is_file():
+                        manifest_paths[entry.name] = addon_dir / entry.name
+                elif entry.name == "__init__.py":
+                    has_init = entry.is_file()
+    except OSError as e:
+        if e.errno not in _NOT_A_DIRECTORY_ERRNOS:
+            raise
+        return None
+    for manifest_name in MANIFEST_NAMES:
+        if manifest_name in manifest_paths:
+            return manifest_paths[manifest_name], has_init
+    return None, has_init
+
+
+class AddonDirStatus(str, Enum):
+    """The result of probing a directory with :func:`probe_addon_dir`."""
+
+    OK = "ok"
+    NOT_A_DIRECTORY = "not-a-directory"
+    NO_MANIFEST = "no-manifest"
+    NO_INIT = "no-init"
+    INVALID_MANIFEST = "invalid-manifest"
+    NOT_INSTALLABLE = "not-installable"
+
+
+def probe_addon_dir(
+    addon_dir: Path,
+    allow_not_installable: bool = False,
+) -> AddonDirStatus:
+    """Detect if a directory contains an Odoo addon, without raising exceptions.
+
+    The statuses are checked in the same order as by :meth:`Addon.from_addon_dir`.
+    The directory is listed once. The manifest is parsed only if
+    ``allow_not_installable`` is False, to check the ``installable`` key, so an
+    invalid manifest is reported only in that case.
+    """
+    listing = _list_addon_dir(addon_dir)
+    if listing is None:
+        return AddonDirStatus.NOT_A_DIRECTORY
+    manifest_path, has_init = listing
+    if manifest_path is None:
+        return AddonDirStatus.NO_MANIFEST
+    if not allow_not_installable:
+        try:
+            manifest = Manifest.from_file(manifest_path, keys=("installable",))
+            if not manifest.installable:
+                return AddonDirStatus.NOT_INSTALLABLE
+        except InvalidManifest:
+            return AddonDirStatus.INVALID_MANIFEST
+    if not has_init:
+        return AddonDirStatus.NO_INIT
+    return AddonDirStatus.OK
+
+
+def probe_addon_dirs(
+    addon_dirs: Iterable[Path],
+    allow_not_installable: bool = False,
+    workers: Optional[int] = None,
+) -> Dict[Path, AddonDirStatus]:
+    """Probe several directories with :func:`probe_addon_dir`.
+
+    Return the status of each directory, in the order of ``addon_dirs``. If
+    ``workers`` is greater than 1, directories are probed concurrently by that many
+    threads.
+    """
+    addon_dirs = list(addon_dirs)
+    if workers is None or workers <= 1:
+        statuses = [probe_addon_dir(d, allow_not_installable) for d in addon_dirs]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            statuses = list(
+                executor.map(
+                    probe_addon_dir,
+                    addon_dirs,
+                    [allow_not_installable] * len(addon_dirs),
+                )
+            )
+    return dict(zip(addon_dirs, statuses))
+
+
 def is_addon_dir(addon_dir: Path, allow_not_installable: bool = False) -> bool:
     """Detect if a directory contains an Odoo addon.
 
     :param addon_dir: The directory to check.
     :param allow_not_installable: Whether to allow the addon to be have
         installable=False in its manifest.
+
+    The manifest is always parsed completely, so a directory with an invalid
+    manifest is not an addon. See :func:`probe_addon_dir` to know why a directory
+    is not an addon.
     """
     try:
         Addon.from_addon_dir(addon_dir, allow_not_installable)
@@ -35,8 +151,8 @@ def is_addon_dir(addon_dir: Path, allow_not_installable: bool = False) -> bool:
 class Addon:
     """Represent a concrete addon manifest."""
 
-    manifest: Manifest
-    "The addon's manifest."
+    __slots__ = ("_manifest", "_manifest_keys", "manifest_path", "name", "path")
+
     manifest_path: Path
     "The path to the addon's manifest file."
     name: str
@@ -44,12 +160,18 @@ class Addon:
 
     def __init__(
         self,
-        manifest: Manifest,
+        manifest: Optional[Manifest],
         manifest_path: Path,
         name: Optional[str] = None,
+        manifest_keys: Optional[Collection[str]] = None,
     ) -> None:
-        """Do not use this constructor, use the from_addon_dir classmethod instead."""
-        self.manifest = manifest
+        """Do not use this constructor, use the from_addon_dir classmethod instead.
+
+        If ``manifest`` is None, it is loaded from ``manifest_path`` on first access,
+        with only ``manifest_keys`` if given.
+        """
+        self._manifest = manifest
+        self._manifest_keys = manifest_keys
         self.manifest_path = manifest_path
         self.path = self.manifest_path.parent
         if name is None:
@@ -57,33 +179,257 @@ class Addon:
         else:
             self.name = name
 
+    @property
+    def manifest(self) -> Manifest:
+        """The addon's manifest.
+
+        For lazy addons, the manifest file is parsed on first access, which raises
+        :class:`InvalidManifest` if it is invalid.
+        """
+        manifest = self._manifest
+        if manifest is None:
+            manifest = Manifest.from_file(self.manifest_path, keys=self._manifest_keys)
+            self._manifest = manifest
+        return manifest
+
+    @manifest.setter
+    def manifest(self, manifest: Manifest) -> None:
+        self._manifest = manifest
+
     @classmethod
     def from_addon_dir(
         cls,
         addon_dir: Path,
         allow_not_installable: bool = False,
+        manifest_keys: Optional[Collection[str]] = None,
+        lazy: bool = False,
     ) -> "Addon":
         """Obtain an Addon object from an addon directory path.
 
         Raises an :class:`AddonNotFound` exception if the directory is not a valid addon
         directory, or if ``allow_not_installable`` is False and the addon is not
         installable.
+
+        If ``manifest_keys`` is given, only these keys are loaded in the addon
+        manifest, as well as the ``installable`` key if ``allow_not_installable`` is
+        False.
+
+        If ``lazy`` is True, the manifest is parsed on first access of
+        :attr:`manifest`. Only the ``installable`` key is loaded beforehand, if
+        ``allow_not_installable`` is False, so other errors in the manifest are not
+        detected. Otherwise obtaining the addon only costs a directory listing.
+
+        If an :class:`AddonCache` is installed, unchanged addons are not reloaded.
         """
-        if not addon_dir.is_dir():
+        cache = _addon_cache
+        if cache is None:
+            return cls._from_addon_dir(
+                addon_dir, allow_not_installable, manifest_keys, lazy
+            )
+        return cache._from_addon_dir(
+            cls,
+            addon_dir,
+            allow_not_installable,
+            manifest_keys,
+            lazy,
+        )
+
+    @classmethod
+    def _from_addon_dir(
+        cls,
+        addon_dir: Path,
+        allow_not_installable: bool,
+        manifest_keys: Optional[Collection[str]],
+        lazy: bool = False,
+    ) -> "Addon":
+        listing = _list_addon_dir(addon_dir)
+        if listing is None:
             msg = f"{addon_dir} is not a directory"
             raise AddonNotFoundNotADirectory(msg)
-        manifest_path = get_manifest_path(addon_dir)
+        manifest_path, has_init = listing
         if not manifest_path:
             msg = f"No manifest file found in {addon_dir}"
             raise AddonNotFoundNoManifest(msg)
+        manifest = None
+        if not lazy or not allow_not_installable:
+            try:
+                if lazy:
+                    keys: Optional[Collection[str]] = ("installable",)
+                elif manifest_keys is not None and not allow_not_installable:
+                    keys = {*manifest_keys, "installable"}
+                else:
+                    keys = manifest_keys
+                loaded_manifest = Manifest.from_file(manifest_path, keys=keys)
+                if not allow_not_installable and not loaded_manifest.installable:
+                    msg = f"{addon_dir} is not installable"
+                    raise AddonNotFoundNotInstallable(msg)
+            except InvalidManifest as e:
+                raise AddonNotFoundInvalidManifest(str(e)) from e
+            if not lazy:
+                manifest = loaded_manifest
+        if not has_init:
+            msg = f"{addon_dir} is missing an __init__.py"
+            raise AddonNotFoundNoInit(msg)
+        return cls(manifest, manifest_path, manifest_keys=manifest_keys)
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of an :class:`AddonCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+_CacheKey = Tuple[Type[Addon], Path]
+# The stat signatures of the addon directory and manifest file.
+_AddonSignature = Tuple[StatSignature, Optional[StatSignature]]
+# An addon, or the class and message of the AddonNotFound exception to raise.
+_CacheValue = Union[Addon, Tuple[Type[AddonNotFound], str]]
+
+
+def _addon_signature(
+    addon_dir: Path,
+    manifest_path: Optional[Path],
+) -> Optional[_AddonSignature]:
+    dir_signature = stat_signature(addon_dir)
+    if dir_signature is None:
+        return None
+    if manifest_path is None:
+        return (dir_signature, None)
+    return (dir_signature, stat_signature(manifest_path))
+
+
+class AddonCache:
+    """An in-memory cache of :class:`Addon` objects, keyed by addon directory.
+
+    When installed with :func:`set_addon_cache`, :meth:`Addon.from_addon_dir`, and
+    therefore :func:`~manifestoo_core.metadata.metadata_from_addon_dir`, return the
+    same :class:`Addon` object for a directory as long as the stat signatures of
+    the directory and its manifest are unchanged. The directory signature changes
+    when ``__init__.py`` or the manifest is added, removed or renamed, but not when
+    ``__init__.py`` is edited, which does not affect the addon. Directories that are
+    not addons are cached too. The least recently used entries above ``maxsize``
+    are discarded.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_CacheKey, Tuple[_AddonSignature, _CacheValue]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        """Return the hit and miss counters, and the size of the cache."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = 0
+
+    def _get(self, key: _CacheKey) -> Optional[_CacheValue]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        signature, value = entry
+        manifest_path = value.manifest_path if isinstance(value, Addon) else None
+        if manifest_path is None and signature[1] is not None:
+            manifest_path = get_manifest_path(key[1])
+        if _addon_signature(key[1], manifest_path) != signature:
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return value
+
+    def _put(
+        self, key: _CacheKey, signature: _AddonSignature, value: _CacheValue
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (signature, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _load(self, key: _CacheKey) -> _CacheValue:
+        addon_class, addon_dir = key
+        # The signature is taken before loading, so that a change made while
+        # loading invalidates the entry.
+        manifest_path = get_manifest_path(addon_dir)
+        signature = _addon_signature(addon_dir, manifest_path)
+        value: _CacheValue
         try:
-            manifest = Manifest.from_file(manifest_path)
-            if not allow_not_installable and not manifest.installable:
+            value = addon_class._from_addon_dir(
+                addon_dir,
+                allow_not_installable=True,
+                manifest_keys=None,
+            )
+        except AddonNotFound as e:
+            value = (e.__class__, str(e))
+        else:
+            if value.manifest_path != manifest_path:
+                # the manifest file was renamed while loading
+                signature = None
+        if signature is not None:
+            self._put(key, signature, value)
+        return value
+
+    def _from_addon_dir(
+        self,
+        addon_class: Type[Addon],
+        addon_dir: Path,
+        allow_not_installable: bool,
+        manifest_keys: Optional[Collection[str]],
+        lazy: bool,
+    ) -> Addon:
+        key = (addon_class, addon_dir)
+        value = self._get(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        if value is None:
+            if manifest_keys is not None or lazy:
+                # partial and lazy manifests are not cached
+                return addon_class._from_addon_dir(
+                    addon_dir, allow_not_installable, manifest_keys, lazy
+                )
+            value = self._load(key)
+        if not isinstance(value, Addon):
+            exception_class, msg = value
+            raise exception_class(msg)
+        if not allow_not_installable:
+            try:
+                installable = value.manifest.installable
+            except InvalidManifest as e:
+                raise AddonNotFoundInvalidManifest(str(e)) from e
+            if not installable:
                 msg = f"{addon_dir} is not installable"
                 raise AddonNotFoundNotInstallable(msg)
-        except InvalidManifest as e:
-            raise AddonNotFoundInvalidManifest(str(e)) from e
-        if not addon_dir.joinpath("__init__.py").is_file():
-            msg = f"{addon_dir} is missing an __init__.py"
-            raise AddonNotFoundNoInit(msg)
-        return cls(manifest, manifest_path)
+        return value
+
+
+_addon_cache: Optional[AddonCache] = None
+
+
+def set_addon_cache(cache: Optional[AddonCache]) -> None:
+    """Install the cache used by :meth:`Addon.from_addon_dir`.
+
+    Use None to disable caching, which is the default.
+    """
+    global _addon_cache  # noqa: PLW0603
+    _addon_cache = cache
+
+
+def get_addon_cache() -> Optional[AddonCache]:
+    """Return the installed addon cache, if any."""
+    return _addon_cache
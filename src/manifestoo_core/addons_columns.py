@@ -0,0 +1,131 @@
+"""A columnar view of the manifests of an addons set, for bulk queries."""
+
+import importlib
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .addons_set import AddonsSet
+from .odoo_series import detect_from_addon_version
+
+__all__ = ["AddonsColumns"]
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+class AddonsColumns:
+    """The manifest fields of the addons of an addons set, by column.
+
+    Row ``i`` of each column is for the addon ``names[i]``, addons being sorted by
+    name. Strings are interned, so equal values are the same object, and
+    dependency counts are stored in a contiguous :class:`array.array`.
+
+    Each manifest is read once, when the columns are built. Filters and
+    aggregations over the columns then involve no :class:`Addon` or
+    :class:`Manifest` access. With NumPy installed, :meth:`to_numpy` returns a
+    structured array, for vectorized queries.
+    """
+
+    __slots__ = (
+        "authors",
+        "categories",
+        "depends_counts",
+        "development_statuses",
+        "licenses",
+        "names",
+        "series",
+        "versions",
+    )
+
+    def __init__(self, addons_set: AddonsSet) -> None:
+        self.names: List[str] = sorted(map(sys.intern, addons_set))
+        "The addon names."
+        self.versions: List[Optional[str]] = []
+        "The versions."
+        self.series: List[Optional[str]] = []
+        "The Odoo series detected from the versions, such as ``17.0``."
+        self.licenses: List[Optional[str]] = []
+        "The licenses."
+        self.authors: List[Tuple[str, ...]] = []
+        "The authors, as split by :attr:`Manifest.authors`."
+        self.categories: List[Optional[str]] = []
+        "The categories."
+        self.development_statuses: List[Optional[str]] = []
+        "The development statuses."
+        self.depends_counts = array("l")
+        "The number of direct dependencies."
+        # Intern each distinct version and author field only once.
+        series_by_version: Dict[Optional[str], Optional[str]] = {None: None}
+        authors_by_author: Dict[Optional[str], Tuple[str, ...]] = {None: ()}
+        for name in self.names:
+            manifest = addons_set[name].manifest
+            version = manifest.version
+            if version is not None and version not in series_by_version:
+                odoo_series = detect_from_addon_version(version)
+                series_by_version[sys.intern(version)] = (
+                    None if odoo_series is None else odoo_series.value
+                )
+            self.versions.append(_intern(version))
+            self.series.append(series_by_version[version])
+            self.licenses.append(_intern(manifest.license))
+            author = manifest.author
+            if author not in authors_by_author:
+                authors = manifest.authors or ()
+                authors_by_author[author] = tuple(map(sys.intern, authors))
+            self.authors.append(authors_by_author[author])
+            self.categories.append(_intern(manifest.category))
+            self.development_statuses.append(_intern(manifest.development_status))
+            self.depends_counts.append(len(manifest.depends))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self, **values: Any) -> List[int]:
+        """Return the indexes of the rows where each column has the given value.
+
+        For instance ``columns.rows(licenses="AGPL-3", series="17.0")``. For
+        ``authors``, the value is one of the authors.
+        """
+        indexes: Iterable[int] = range(len(self))
+        for column, value in values.items():
+            if column not in self.__slots__:
+                msg = f"unknown column {column!r}"
+                raise TypeError(msg)
+            column_values = getattr(self, column)
+            if column == "authors":
+                indexes = [i for i in indexes if value in column_values[i]]
+            else:
+                indexes = [i for i in indexes if column_values[i] == value]
+        return list(indexes)
+
+    def to_numpy(self) -> Any:
+        """Return the columns as a NumPy structured array.
+
+        String fields have a fixed width unicode type, with None as an empty string,
+        and ``authors`` are joined with commas. Raise :class:`ImportError` if NumPy
+        is not installed.
+        """
+        numpy = importlib.import_module("numpy")
+        columns: Dict[str, List[Any]] = {
+            "name": self.names,
+            "version": [v or "" for v in self.versions],
+            "series": [v or "" for v in self.series],
+            "license": [v or "" for v in self.licenses],
+            "authors": [",".join(v) for v in self.authors],
+            "category": [v or "" for v in self.categories],
+            "development_status": [v or "" for v in self.development_statuses],
+        }
+        dtype = [
+            (field, f"U{max(map(len, values), default=0) or 1}")
+            for field, values in columns.items()
+        ]
+        dtype.append(("depends_count", "i4"))
+        result = numpy.empty(len(self), dtype=dtype)
+        for field, values in columns.items():
+            result[field] = values
+        result["depends_count"] = numpy.frombuffer(
+            self.depends_counts, dtype=self.depends_counts.typecode
+        )
+        return result
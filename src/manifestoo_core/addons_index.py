@@ -0,0 +1,149 @@
+"""Inverted indexes over the manifest fields of an addons set."""
+
+from typing import Callable, Collection, Dict, FrozenSet, Iterable, Set, Tuple, Union
+
+from .addon import Addon
+from .addons_set import AddonsSet
+from .manifest import Manifest
+
+__all__ = ["INDEXED_FIELDS", "AddonsIndex"]
+
+
+def _optional(value: object) -> Tuple[str, ...]:
+    return (value,) if isinstance(value, str) and value else ()
+
+
+def _python_dependencies(manifest: Manifest) -> Tuple[str, ...]:
+    dependencies = manifest.external_dependencies.get("python")
+    if not isinstance(dependencies, (list, tuple)):
+        return ()
+    return tuple(d for d in dependencies if isinstance(d, str) and d)
+
+
+INDEXED_FIELDS: Dict[str, Callable[[Manifest], Iterable[str]]] = {
+    "authors": lambda manifest: manifest.authors or (),
+    "license": lambda manifest: _optional(manifest.license),
+    "category": lambda manifest: _optional(manifest.category),
+    "development_status": lambda manifest: _optional(manifest.development_status),
+    "python": _python_dependencies,
+}
+"""The fields that :class:`AddonsIndex` can index, with the values of a manifest.
+
+``authors`` are split as by :attr:`Manifest.authors`, and ``python`` are the
+external Python dependencies, when they are a list of strings.
+"""
+
+
+class AddonsIndex:
+    """Inverted indexes from manifest field values to the addons having them.
+
+    ``fields`` are keys of :data:`INDEXED_FIELDS`. Each manifest is read once,
+    so queries cost time proportional to the size of their result, and are sets of
+    addon names that can be combined with set operations.
+
+    The index follows the modifications of the addons set: when its
+    :attr:`~manifestoo_core.addons_set.AddonsSet.version` has changed, the next
+    query updates the entries of the added, removed and replaced addons only.
+    """
+
+    def __init__(
+        self,
+        addons_set: AddonsSet,
+        fields: Collection[str] = tuple(INDEXED_FIELDS),
+    ) -> None:
+        unknown = set(fields) - INDEXED_FIELDS.keys()
+        if unknown:
+            msg = f"cannot index {', '.join(sorted(unknown))}"
+            raise ValueError(msg)
+        self._addons_set = addons_set
+        self._version = -1
+        self._addons: Dict[str, Addon] = {}
+        self._postings: Dict[str, Dict[str, Set[str]]] = {f: {} for f in fields}
+        # the indexed values of each addon, to remove them
+        self._values: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._sync()
+
+    def _sync(self) -> None:
+        """Apply the modifications of the addons set since the last query."""
+        if self._addons_set.version == self._version:
+            return
+        addons = dict(self._addons_set)
+        # Each change is recorded as it is applied, so that if reading a manifest
+        # fails, the next query resumes from a consistent state.
+        for name, addon in list(self._addons.items()):
+            if addons.get(name) is not addon:
+                self._remove(name)
+                del self._addons[name]
+        for name, addon in addons.items():
+            if self._addons.get(name) is not addon:
+                self._add(name, addon)
+                self._addons[name] = addon
+        self._version = self._addons_set.version
+
+    def _add(self, name: str, addon: Addon) -> None:
+        # read the manifest before modifying anything, as it may be invalid
+        manifest = addon.manifest
+        values = {
+            field: tuple(INDEXED_FIELDS[field](manifest)) for field in self._postings
+        }
+        self._values[name] = values
+        for field, field_values in values.items():
+            postings = self._postings[field]
+            for value in field_values:
+                postings.setdefault(value, set()).add(name)
+
+    def _remove(self, name: str) -> None:
+        for field, field_values in self._values.pop(name).items():
+            postings = self._postings[field]
+            for value in field_values:
+                names = postings[value]
+                names.discard(name)
+                if not names:
+                    del postings[value]
+
+    @property
+    def version(self) -> int:
+        """The :attr:`~manifestoo_core.addons_set.AddonsSet.version` of the addons
+        set that the index reflects."""
+        self._sync()
+        return self._version
+
+    def get(self, field: str, value: str) -> FrozenSet[str]:
+        """Return the names of the addons having a value for an indexed field.
+
+        Raise :class:`KeyError` if the field is not indexed.
+        """
+        self._sync()
+        return frozenset(self._postings[field].get(value, ()))
+
+    def facets(self, field: str) -> Dict[str, int]:
+        """Return the number of addons for each value of an indexed field.
+
+        Raise :class:`KeyError` if the field is not indexed.
+        """
+        self._sync()
+        return {value: len(names) for value, names in self._postings[field].items()}
+
+    def select(self, **criteria: Union[str, Collection[str]]) -> FrozenSet[str]:
+        """Return the names of the addons matching all the criteria.
+
+        Each keyword argument is an indexed field, with a value or a collection of
+        values of which the addons must have one. For instance
+        ``index.select(authors="Odoo Community Association (OCA)",
+        license=["AGPL-3", "LGPL-3"])``. Without criteria, return all the addons.
+
+        Raise :class:`KeyError` if a field is not indexed.
+        """
+        self._sync()
+        matches = []
+        for field, values in criteria.items():
+            postings = self._postings[field]
+            if isinstance(values, str):
+                matches.append(postings.get(values, set()))
+            else:
+                matches.append(set().union(*(postings.get(v, ()) for v in values)))
+        if not matches:
+            return frozenset(self._addons)
+        # intersect starting from the smallest set
+        matches.sort(key=len)
+        return frozenset(matches[0].intersection(*matches[1:]))
@@ -1,30 +1,773 @@
+import asyncio
+import fnmatch
 import logging
+import marshal
+import os
+import sys
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Dict, Iterable
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from .addon import Addon
-from .exceptions import AddonNotFound
+from .addon import _NOT_A_DIRECTORY_ERRNOS, Addon, _addon_signature, _AddonSignature
+from .exceptions import AddonNotFound, InvalidManifest
+from .manifest import MANIFEST_NAMES, CompactManifest, Manifest, get_manifest_path
+from .manifest_cache import StatSignature, stat_signature
 
 _logger = logging.getLogger(__name__)
 
+PRUNED_DIR_NAMES = frozenset((".git", "node_modules", "setup", "static"))
+"""Directories that :meth:`AddonsSet.add_from_addons_tree` does not descend into."""
+
+T = TypeVar("T")
+
+# Identifies snapshot files, and their format version.
+_SNAPSHOT_HEADER = ("manifestoo_core.AddonsSet", 3)
+
+
+class AddonsSetChanges(NamedTuple):
+    """The names of the addons added, removed and modified by a refresh."""
+
+    added: Set[str]
+    removed: Set[str]
+    modified: Set[str]
+
+
+class _AddonScan(NamedTuple):
+    """The result of loading an addon directory."""
+
+    signature: Optional[_AddonSignature]
+    manifest_path: Optional[Path]
+    addon: Optional[Addon]
+
+
+class _ScanOptions(NamedTuple):
+    """How to find addons in an addons directory, and load them."""
+
+    manifest_keys: Optional[Collection[str]]
+    lazy: bool
+    # 1 to only look for addons in the immediate subdirectories.
+    max_depth: int = 1
+    ignore: Collection[str] = ()
+    # Record stat signatures, so refresh() only loads again what changed.
+    track_changes: bool = False
+    # A directory tree, where pruned directories are skipped at every depth.
+    tree: bool = False
+
+
+class _AddonsDirScan(NamedTuple):
+    """The result of scanning an addons directory."""
+
+    addons_dir: Path
+    options: _ScanOptions
+    signature: Optional[StatSignature]
+    addon_scans: Dict[Path, _AddonScan]
+
+
+# An addons directory to scan, with its load options and previous scan.
+_ScanRequest = Tuple[Path, _ScanOptions, Optional[_AddonsDirScan]]
+
 
 class AddonsSet(Dict[str, Addon]):
+    """A dictionary of addons, by name.
+
+    Its :attr:`version` is incremented on each modification, so structures derived
+    from an addons set can tell when they are stale.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._scans: List[_AddonsDirScan] = []
+        self.version = 0
+        "A counter incremented each time the addons set is modified."
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # By default, the items would be restored with __setitem__ before the
+        # attributes, including version.
+        return (self.__class__, (dict(self),), self.__dict__)
+
+    def __setitem__(self, name: str, addon: Addon) -> None:
+        super().__setitem__(name, addon)
+        self.version += 1
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self.version += 1
+
+    def __ior__(self, other: Any) -> "AddonsSet":  # type: ignore[misc,override]
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def pop(self, *args: Any) -> Any:
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> Tuple[str, Addon]:
+        self.version += 1
+        return super().popitem()
+
+    def setdefault(self, *args: Any) -> Any:
+        self.version += 1
+        return super().setdefault(*args)
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
     def __str__(self) -> str:
         return ",".join(sorted(self.keys()))
 
-    def add_from_addons_dir(self, addons_dir: Path) -> None:
-        if not addons_dir.is_dir():
-            _logger.warning(f"ignoring {addons_dir}: not a directory")
-            return
-        for addon_dir in addons_dir.iterdir():
-            try:
-                addon = Addon.from_addon_dir(addon_dir)
-            except AddonNotFound as e:  # noqa: PERF203
-                _logger.debug(f"ignoring {addon_dir}: {e}")
+    def add_from_addons_dir(
+        self,
+        addons_dir: Path,
+        manifest_keys: Optional[Collection[str]] = None,
+        workers: Optional[int] = None,
+        lazy: bool = False,
+        track_changes: bool = False,
+    ) -> None:
+        """Add the installable addons found in a directory.
+
+        If ``manifest_keys`` is given, only these keys are loaded in the addons
+        manifests. If ``lazy`` is True, manifests are parsed on first access. See
+        :meth:`Addon.from_addon_dir`.
+
+        The directory is listed with :func:`os.scandir`, so entries that are not
+        directories are skipped without being stat'ed.
+
+        If ``workers`` is greater than 1, addons are loaded concurrently by that
+        many threads. See :meth:`add_from_addons_dirs` for ``track_changes``.
+        """
+        self.add_from_addons_dirs(
+            [addons_dir], manifest_keys, workers, lazy, track_changes
+        )
+
+    def add_from_addons_dirs(
+        self,
+        addons_dirs: Iterable[Path],
+        manifest_keys: Optional[Collection[str]] = None,
+        workers: Optional[int] = None,
+        lazy: bool = False,
+        track_changes: bool = False,
+    ) -> None:
+        """Add the installable addons found in several directories.
+
+        Addons found in later directories replace addons with the same name found in
+        earlier directories.
+
+        If ``workers`` is greater than 1, the directories are listed and the addons
+        are loaded concurrently by that many threads, which is faster when the
+        filesystem has a high latency. The result is the same as without workers.
+
+        The directories are remembered, to be scanned again by :meth:`refresh`. If
+        ``track_changes`` is True, the stat signatures of the directories and
+        manifest files are recorded too, so that :meth:`refresh` only loads again
+        the addons that changed. This costs a few stat calls per addon.
+        """
+        options = _ScanOptions(manifest_keys, lazy, track_changes=track_changes)
+        scans = _scan_addons_dirs(
+            [(addons_dir, options, None) for addons_dir in addons_dirs],
+            workers,
+        )
+        self._scans.extend(scans)
+        self.update(_scanned_addons(scans))
+
+    def add_from_addons_tree(  # noqa: PLR0913
+        self,
+        root: Path,
+        max_depth: int = 3,
+        ignore: Collection[str] = (),
+        manifest_keys: Optional[Collection[str]] = None,
+        workers: Optional[int] = None,
+        lazy: bool = False,
+        track_changes: bool = False,
+    ) -> None:
+        """Add the installable addons found in a directory tree.
+
+        Addons are searched in the subdirectories of ``root``, down to ``max_depth``
+        levels: with a ``max_depth`` of 1, this is like :meth:`add_from_addons_dir`,
+        except that pruned directories are skipped.
+        Directories containing a manifest file are not descended into. Directories
+        named as in :data:`PRUNED_DIR_NAMES`, or matching one of the :mod:`fnmatch`
+        patterns of ``ignore``, are skipped.
+
+        Directories are traversed depth-first, in the order in which they are
+        listed, and addons found later replace addons with the same name found
+        earlier. See :meth:`add_from_addons_dirs` for the other arguments.
+        """
+        options = _ScanOptions(
+            manifest_keys, lazy, max_depth, tuple(ignore), track_changes, tree=True
+        )
+        scans = _scan_addons_dirs([(root, options, None)], workers)
+        self._scans.extend(scans)
+        self.update(_scanned_addons(scans))
+
+    def refresh(self, workers: Optional[int] = None) -> AddonsSetChanges:
+        """Scan again the directories added with the add_from_* methods.
+
+        The addons set is updated in place to the content it would have if the
+        directories were added again, in the same order. For directories added with
+        ``track_changes``, only addons whose directory or manifest file has a
+        different stat signature since the previous scan are loaded again, and
+        only addons directories that have a different stat signature are listed
+        again. Other addons are all loaded again, and the previous :class:`Addon`
+        object is kept if the manifest is unchanged. Directory trees are always
+        traversed again.
+        Addons that were found in these directories by the previous scan and are
+        not found anymore are removed. Addons added otherwise, for instance by
+        item assignment, are kept.
+
+        Return the names of the addons that were added, removed, or replaced by a
+        new :class:`Addon` object.
+        """
+        scans = _scan_addons_dirs(
+            [(scan.addons_dir, scan.options, scan) for scan in self._scans],
+            workers,
+        )
+        addons = _scanned_addons(scans)
+        previous_addons = _scanned_addons(self._scans)
+        changes = AddonsSetChanges(
+            added={name for name in addons if name not in self},
+            removed={
+                name for name in previous_addons if name in self and name not in addons
+            },
+            modified={
+                name
+                for name, addon in addons.items()
+                if name in self and self[name] is not addon
+            },
+        )
+        # Update in place, so the set is never seen empty by other threads.
+        for name in changes.removed:
+            del self[name]
+        for name in changes.added | changes.modified:
+            self[name] = addons[name]
+        self._scans = scans
+        return changes
+
+    def compact(self) -> None:
+        """Reduce the memory used by the addons of the set.
+
+        The addons are replaced by new :class:`Addon` objects with a
+        :class:`CompactManifest`, and an interned name. The replaced addons are
+        not modified, so addons shared with an
+        :class:`~manifestoo_core.addon.AddonCache` or another addons set keep their
+        complete manifest. Lazy addons whose manifest was not loaded yet, and
+        addons with an invalid manifest, are left alone.
+
+        Addons added afterwards, for instance by :meth:`refresh`, are not
+        compacted until this method is called again, which is cheap for the addons
+        already compacted.
+        """
+        compacted: Dict[int, Addon] = {}
+
+        def compact_addon(addon: Addon) -> Addon:
+            manifest = addon._manifest
+            if manifest is None or isinstance(manifest, CompactManifest):
+                return addon
+            new_addon = compacted.get(id(addon))
+            if new_addon is None:
+                try:
+                    compact_manifest = CompactManifest(manifest.manifest_dict)
+                except InvalidManifest:
+                    # keep it, so the error is raised when accessing the key
+                    return addon
+                new_addon = compacted[id(addon)] = type(addon)(
+                    compact_manifest,
+                    addon.manifest_path,
+                    sys.intern(addon.name),
+                    addon._manifest_keys,
+                )
+            return new_addon
+
+        # Replace the addons in the scans too, so refresh() does not see them as
+        # modified.
+        self._scans = [
+            scan._replace(
+                addon_scans={
+                    addon_dir: addon_scan._replace(
+                        addon=compact_addon(addon_scan.addon)
+                    )
+                    if addon_scan.addon is not None
+                    else addon_scan
+                    for addon_dir, addon_scan in scan.addon_scans.items()
+                }
+            )
+            for scan in self._scans
+        ]
+        for name, addon in list(self.items()):
+            new_addon = compact_addon(addon)
+            if new_addon is not addon:
+                self[name] = new_addon
+
+    def save(self, path: Path) -> None:
+        """Save a snapshot of the directories scanned by the add_from_* methods.
+
+        The snapshot records the stat signatures of the directories and manifest
+        files, and the loaded manifests, so :meth:`load` only loads again the
+        addons that changed since. This requires the directories to be added with
+        ``track_changes``, otherwise all their addons are loaded again. Addons that
+        were not added by the add_from_* methods are not saved.
+
+        The snapshot is written with :mod:`marshal`, so it must not be loaded from
+        an untrusted source.
+        """
+        data = marshal.dumps((_SNAPSHOT_HEADER, [_dump_scan(s) for s in self._scans]))
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path, workers: Optional[int] = None) -> "AddonsSet":
+        """Create an addons set from a snapshot written by :meth:`save`.
+
+        The snapshot is validated as by :meth:`refresh`: only addons whose
+        directory or manifest file changed since the snapshot are loaded again, and
+        only addons directories that changed are listed again. The result is
+        therefore the same as adding the directories again.
+
+        This is about 3 to 4 times faster than adding the directories again, not
+        instantaneous: the addons are still rebuilt from the snapshot, and
+        revalidated with two stat calls each.
+
+        Raise :class:`ValueError` if the file is not a valid snapshot, and
+        :class:`OSError` if it cannot be read.
+        """
+        try:
+            header, data = marshal.loads(path.read_bytes())  # noqa: S302
+            scans = [_load_scan(scan) for scan in data]
+        except (EOFError, TypeError, ValueError) as e:
+            msg = f"{path} is not a valid addons set snapshot: {e}"
+            raise ValueError(msg) from e
+        if header != _SNAPSHOT_HEADER:
+            msg = f"{path} is not a valid addons set snapshot: unsupported format"
+            raise ValueError(msg)
+        addons_set = cls()
+        addons_set._scans = scans
+        addons_set.update(_scanned_addons(scans))
+        addons_set.refresh(workers)
+        return addons_set
+
+    def _scanned_dirs(self) -> Set[Path]:
+        """Return the addons directories and their subdirectories of the last scan.
+
+        For directory trees, this includes the directories between the root and
+        the candidate addon directories.
+        """
+        scanned_dirs = set()
+        for scan in self._scans:
+            scanned_dirs.add(scan.addons_dir)
+            for addon_dir in scan.addon_scans:
+                scanned_dirs.add(addon_dir)
+                parent = addon_dir.parent
+                while parent != scan.addons_dir and parent not in scanned_dirs:
+                    scanned_dirs.add(parent)
+                    parent = parent.parent
+        return scanned_dirs
+
+
+def _scanned_addons(scans: Iterable[_AddonsDirScan]) -> Dict[str, Addon]:
+    addons = {}
+    for scan in scans:
+        for addon_scan in scan.addon_scans.values():
+            if addon_scan.addon is not None:
+                addons[addon_scan.addon.name] = addon_scan.addon
+    return addons
+
+
+def _dump_scan(scan: _AddonsDirScan) -> Tuple[Any, ...]:
+    """Return an addons directory scan as a marshallable tuple.
+
+    Addon directories are stored relative to the addons directory, and manifest
+    paths by their name, as building paths is the main cost of loading.
+    """
+    manifest_keys = scan.options.manifest_keys
+    addon_scans = []
+    for addon_dir, addon_scan in scan.addon_scans.items():
+        addon = addon_scan.addon
+        addon_data = None
+        if addon is not None:
+            manifest = addon._manifest
+            addon_data = (
+                addon.name,
+                None if manifest is None else manifest.manifest_dict,
+            )
+        manifest_path = addon_scan.manifest_path
+        addon_scans.append(
+            (
+                str(addon_dir.relative_to(scan.addons_dir)),
+                addon_scan.signature,
+                None if manifest_path is None else manifest_path.name,
+                addon_data,
+            )
+        )
+    return (
+        str(scan.addons_dir),
+        None if manifest_keys is None else tuple(manifest_keys),
+        scan.options.lazy,
+        scan.options.max_depth,
+        tuple(scan.options.ignore),
+        scan.options.track_changes,
+        scan.options.tree,
+        scan.signature,
+        addon_scans,
+    )
+
+
+def _load_scan(data: Tuple[Any, ...]) -> _AddonsDirScan:
+    """Return the addons directory scan dumped by _dump_scan."""
+    (
+        addons_dir,
+        manifest_keys,
+        lazy,
+        max_depth,
+        ignore,
+        track_changes,
+        tree,
+        signature,
+        addon_scans,
+    ) = data
+    addons_dir = Path(addons_dir)
+    options = _ScanOptions(manifest_keys, lazy, max_depth, ignore, track_changes, tree)
+    scans = {}
+    for addon_dir_name, addon_signature, manifest_name, addon_data in addon_scans:
+        if manifest_name is None:
+            manifest_path = None
+            addon_dir = addons_dir.joinpath(addon_dir_name)
+        else:
+            manifest_path = addons_dir.joinpath(addon_dir_name, manifest_name)
+            addon_dir = manifest_path.parent
+        addon = None
+        if addon_data is not None and manifest_path is not None:
+            name, manifest_dict = addon_data
+            addon = Addon(
+                None if manifest_dict is None else Manifest(manifest_dict),
+                manifest_path,
+                name,
+                manifest_keys,
+            )
+        scans[addon_dir] = _AddonScan(addon_signature, manifest_path, addon)
+    return _AddonsDirScan(addons_dir, options, signature, scans)
+
+
+def _map(
+    executor: Optional[Executor],
+    func: Callable[..., T],
+    *iterables: Iterable[Any],
+) -> List[T]:
+    if executor is None:
+        return list(map(func, *iterables))
+    # map() yields results in order, so the result does not depend on the executor.
+    return list(executor.map(func, *iterables))
+
+
+def _scan_addons_dirs(
+    requests: Sequence[_ScanRequest],
+    workers: Optional[int],
+) -> List[_AddonsDirScan]:
+    """Scan addons directories, reusing what did not change since previous scans."""
+    executor = None
+    if workers is not None and workers > 1:
+        executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        listings = _map(
+            executor,
+            _list_addons_dir_again,
+            [addons_dir for addons_dir, _, _ in requests],
+            [options for _, options, _ in requests],
+            [previous for _, _, previous in requests],
+        )
+        addon_dirs: List[Path] = []
+        options_list: List[_ScanOptions] = []
+        previous_addon_scans: List[Optional[_AddonScan]] = []
+        for (_, options, previous), (_, dir_addon_dirs) in zip(requests, listings):
+            for addon_dir in dir_addon_dirs:
+                addon_dirs.append(addon_dir)
+                options_list.append(options)
+                previous_addon_scans.append(
+                    previous.addon_scans.get(addon_dir) if previous else None
+                )
+        addon_scans = iter(
+            _map(
+                executor,
+                _scan_addon_again,
+                addon_dirs,
+                options_list,
+                previous_addon_scans,
+            )
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [
+        _AddonsDirScan(
+            addons_dir,
+            options,
+            signature,
+            {addon_dir: next(addon_scans) for addon_dir in dir_addon_dirs},
+        )
+        for (addons_dir, options, _), (signature, dir_addon_dirs) in zip(
+            requests, listings
+        )
+    ]
+
+
+def _list_addons_dir_again(
+    addons_dir: Path,
+    options: _ScanOptions,
+    previous: Optional[_AddonsDirScan],
+) -> Tuple[Optional[StatSignature], List[Path]]:
+    """Return the signature and candidate addon directories of an addons directory.
+
+    The directory is not listed if its signature is the same as in ``previous``,
+    unless it must be traversed recursively.
+    """
+    signature = stat_signature(addons_dir) if options.track_changes else None
+    if options.tree and options.max_depth > 1:
+        return signature, _find_addon_dirs(addons_dir, options)
+    if (
+        previous is not None
+        and signature is not None
+        and signature == previous.signature
+    ):
+        return signature, list(previous.addon_scans)
+    if options.tree:
+        return signature, _find_addon_dirs(addons_dir, options)
+    return signature, _list_addons_dir(addons_dir)
+
+
+def _scan_addon_again(
+    addon_dir: Path,
+    options: _ScanOptions,
+    previous: Optional[_AddonScan],
+) -> _AddonScan:
+    """Load an addon directory, unless its signature is the same as in ``previous``.
+
+    Without ``track_changes``, the addon is always loaded, and ``previous`` is
+    returned if the addon is the same.
+    """
+    if not options.track_changes:
+        addon = _load_addon(addon_dir, options.manifest_keys, options.lazy)
+        if previous is not None and _same_addon(previous.addon, addon):
+            return previous
+        return _AddonScan(None, None if addon is None else addon.manifest_path, addon)
+    if (
+        previous is not None
+        and previous.signature is not None
+        and _addon_signature(addon_dir, previous.manifest_path) == previous.signature
+    ):
+        return previous
+    # The signature is taken before loading, so that a change made while loading
+    # is seen by the next scan.
+    manifest_path = get_manifest_path(addon_dir)
+    signature = _addon_signature(addon_dir, manifest_path)
+    addon = _load_addon(addon_dir, options.manifest_keys, options.lazy)
+    if addon is not None and addon.manifest_path != manifest_path:
+        # the manifest file was renamed while loading
+        manifest_path = addon.manifest_path
+        signature = None
+    return _AddonScan(signature, manifest_path, addon)
+
+
+def _same_addon(previous: Optional[Addon], addon: Optional[Addon]) -> bool:
+    """Tell if a newly loaded addon is the same as a previously loaded one."""
+    if previous is None or addon is None:
+        return previous is addon
+    if previous.manifest_path != addon.manifest_path:
+        return False
+    previous_manifest = previous._manifest
+    if previous_manifest is None:
+        # lazy addon, that will load the current manifest on first access
+        return True
+    try:
+        # compare with the same manifest class, as compacted manifests drop keys
+        manifest = type(previous_manifest)(addon.manifest.manifest_dict)
+    except InvalidManifest:
+        return False
+    return previous_manifest.manifest_dict == manifest.manifest_dict
+
+
+def _list_addons_dir(addons_dir: Path) -> List[Path]:
+    """Return the subdirectories of an addons directory."""
+    try:
+        with os.scandir(addons_dir) as it:
+            entries = list(it)
+    except OSError as e:
+        if e.errno not in _NOT_A_DIRECTORY_ERRNOS:
+            raise
+        _logger.warning(f"ignoring {addons_dir}: not a directory")
+        return []
+    addon_dirs = []
+    for entry in entries:
+        addon_dir = addons_dir / entry.name
+        if not entry.is_dir():
+            _logger.debug(f"ignoring {addon_dir}: not a directory")
+            continue
+        addon_dirs.append(addon_dir)
+    return addon_dirs
+
+
+def _scandir(directory: Path) -> Optional[List["os.DirEntry[str]"]]:
+    try:
+        with os.scandir(directory) as it:
+            return list(it)
+    except OSError as e:
+        if e.errno not in _NOT_A_DIRECTORY_ERRNOS:
+            raise
+        return None
+
+
+def _find_addon_dirs(root: Path, options: _ScanOptions) -> List[Path]:
+    """Return the candidate addon directories of a directory tree."""
+    addon_dirs: List[Path] = []
+
+    def walk(directory: Path, entries: List["os.DirEntry[str]"], depth: int) -> None:
+        for entry in entries:
+            if not entry.is_dir() or _is_pruned(entry.name, options.ignore):
                 continue
+            subdir = directory / entry.name
+            if depth >= options.max_depth:
+                # candidate, which will be listed when loading it
+                addon_dirs.append(subdir)
+                continue
+            subdir_entries = _scandir(subdir)
+            if subdir_entries is None:
+                continue
+            if any(e.name in MANIFEST_NAMES for e in subdir_entries):
+                addon_dirs.append(subdir)
             else:
-                self[addon.name] = addon
+                walk(subdir, subdir_entries, depth + 1)
+
+    entries = _scandir(root)
+    if entries is None:
+        _logger.warning(f"ignoring {root}: not a directory")
+    else:
+        walk(root, entries, 1)
+    return addon_dirs
+
+
+def _is_pruned(name: str, ignore: Collection[str]) -> bool:
+    return name in PRUNED_DIR_NAMES or any(
+        fnmatch.fnmatch(name, pattern) for pattern in ignore
+    )
+
+
+def _load_addon(
+    addon_dir: Path,
+    manifest_keys: Optional[Collection[str]],
+    lazy: bool = False,
+) -> Optional[Addon]:
+    try:
+        return Addon.from_addon_dir(addon_dir, manifest_keys=manifest_keys, lazy=lazy)
+    except AddonNotFound as e:
+        _logger.debug(f"ignoring {addon_dir}: {e}")
+        return None
+
+
+def iter_addon_dirs(
+    addons_dirs: Iterable[Path],
+    manifest_keys: Optional[Collection[str]] = None,
+    lazy: bool = False,
+) -> Iterator[Tuple[Path, Union[Addon, AddonNotFound]]]:
+    """Iterate over the subdirectories of addons directories, loading them as addons.
+
+    Yield each subdirectory with its :class:`Addon`, or with the
+    :class:`AddonNotFound` exception telling why it is not an installable addon.
+    Directories are listed one at a time and addons are loaded as the iteration
+    progresses, so nothing is loaded after the iteration is stopped. See
+    :meth:`Addon.from_addon_dir` for ``manifest_keys`` and ``lazy``.
+    """
+    for addons_dir in addons_dirs:
+        for addon_dir in _list_addons_dir(addons_dir):
+            result: Union[Addon, AddonNotFound]
+            try:
+                result = Addon.from_addon_dir(
+                    addon_dir, manifest_keys=manifest_keys, lazy=lazy
+                )
+            except AddonNotFound as e:
+                result = e
+            yield addon_dir, result
+
+
+def iter_addons(
+    addons_dirs: Iterable[Path],
+    manifest_keys: Optional[Collection[str]] = None,
+    lazy: bool = False,
+) -> Iterator[Addon]:
+    """Iterate over the installable addons found in directories.
+
+    This is :func:`iter_addon_dirs` without the directories that are not
+    installable addons. Addons are yielded in the order in which
+    :meth:`AddonsSet.add_from_addons_dirs` adds them, so several addons may have
+    the same name, the last one taking precedence.
+    """
+    for addon_dir, result in iter_addon_dirs(addons_dirs, manifest_keys, lazy):
+        if isinstance(result, Addon):
+            yield result
+        else:
+            _logger.debug(f"ignoring {addon_dir}: {result}")
+
+
+async def aiter_addons(
+    addons_dirs: Iterable[Path],
+    manifest_keys: Optional[Collection[str]] = None,
+    concurrency: int = 8,
+    executor: Optional[Executor] = None,
+) -> AsyncIterator[Addon]:
+    """Asynchronously iterate over the installable addons found in directories.
+
+    Addons are yielded in the order in which :meth:`AddonsSet.add_from_addons_dirs`
+    adds them, so adding them to an :class:`AddonsSet` gives the same result.
+
+    Directory listings and addons loading run in ``executor`` (the default executor
+    of the event loop if None), with at most ``concurrency`` addons being loaded at
+    a time. When the iteration is cancelled or stopped early, pending loads are
+    cancelled.
 
-    def add_from_addons_dirs(self, addons_dirs: Iterable[Path]) -> None:
+    Raise :class:`ValueError` if ``concurrency`` is less than 1.
+    """
+    if concurrency < 1:
+        msg = f"concurrency must be at least 1, not {concurrency}"
+        raise ValueError(msg)
+    loop = asyncio.get_running_loop()
+    load = partial(_load_addon, manifest_keys=manifest_keys)
+    pending: Deque[asyncio.Future[Optional[Addon]]] = deque()
+    try:
         for addons_dir in addons_dirs:
-            self.add_from_addons_dir(addons_dir)
+            addon_dirs = await loop.run_in_executor(
+                executor, _list_addons_dir, addons_dir
+            )
+            for addon_dir in addon_dirs:
+                if len(pending) >= concurrency:
+                    addon = await pending.popleft()
+                    if addon is not None:
+                        yield addon
+                pending.append(loop.run_in_executor(executor, load, addon_dir))
+        while pending:
+            addon = await pending.popleft()
+            if addon is not None:
+                yield addon
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,269 @@
+"""Keep an :class:`~manifestoo_core.addons_set.AddonsSet` up to date.
+
+An :class:`AddonsWatcher` monitors the addons directories of an addons set and
+their subdirectories, and refreshes the set with
+:meth:`~manifestoo_core.addons_set.AddonsSet.refresh` when they change. It uses
+inotify on Linux, and polls the directories elsewhere.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set
+
+from .addons_set import AddonsSet, AddonsSetChanges
+
+__all__ = ["AddonsWatcher", "inotify_available"]
+
+_logger = logging.getLogger(__name__)
+
+# From <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+# struct inotify_event, which is followed by a name of len bytes.
+_EVENT_HEADER = struct.Struct("iIII")
+# Events keep being collected for at most this many debounce delays.
+_MAX_DEBOUNCE_DELAYS = 10
+
+_libc: Optional[Any] = None
+
+
+def _load_libc() -> Optional[Any]:
+    global _libc  # noqa: PLW0603
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        except OSError:
+            return None
+        if hasattr(libc, "inotify_init1"):
+            _libc = libc
+    return _libc
+
+
+def inotify_available() -> bool:
+    """Return True if inotify can be used on this platform."""
+    return _load_libc() is not None
+
+
+def _os_error(path: Optional[Path] = None) -> OSError:
+    error_number = ctypes.get_errno()
+    if path is None:
+        return OSError(error_number, os.strerror(error_number))
+    return OSError(error_number, os.strerror(error_number), str(path))
+
+
+class _Inotify:
+    """A minimal inotify wrapper, watching directories."""
+
+    def __init__(self) -> None:
+        libc = _load_libc()
+        if libc is None:  # pragma: no cover
+            msg = "inotify is not available"
+            raise OSError(msg)
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:  # pragma: no cover
+            raise _os_error()
+        self._wds: Dict[Path, int] = {}
+        self._paths: Dict[int, Path] = {}
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+    def watch(self, paths: Set[Path]) -> None:
+        """Watch exactly these directories."""
+        for path in set(self._wds) - paths:
+            wd = self._wds.pop(path)
+            del self._paths[wd]
+            self._libc.inotify_rm_watch(self.fd, wd)
+        for path in paths - set(self._wds):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+            if wd < 0:
+                error = _os_error(path)
+                if error.errno in (errno.ENOENT, errno.ENOTDIR):
+                    # removed since the last scan
+                    continue
+                raise error
+            self._wds[path] = wd
+            self._paths[wd] = path
+
+    def read(self) -> None:
+        """Read the pending events."""
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size + length
+                if mask & _IN_IGNORED and wd in self._paths:
+                    # the directory was removed, so was the watch
+                    del self._wds[self._paths.pop(wd)]
+
+
+class AddonsWatcher:
+    """Refresh an addons set when its directories change.
+
+    The watched directories are those added to the addons set with
+    :meth:`~manifestoo_core.addons_set.AddonsSet.add_from_addons_dirs`, and their
+    subdirectories. Events are debounced: the set is refreshed when no event was
+    received for ``debounce`` seconds, and ``callback`` is then called with the
+    :class:`~manifestoo_core.addons_set.AddonsSetChanges` if there are any.
+
+    inotify is used if ``use_inotify`` is True and it is available. Addons
+    directories that do not exist when they are scanned are not watched then.
+    Otherwise the set is refreshed every ``poll_interval`` seconds, which is cheap
+    if the directories were added with ``track_changes``, as only changed addons
+    are then loaded again.
+
+    Use :meth:`start` to watch in a background thread, or call :meth:`poll`
+    repeatedly. Call :meth:`stop` when done. The watcher is also a context
+    manager, which starts and stops it.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        addons_set: AddonsSet,
+        callback: Optional[Callable[[AddonsSetChanges], None]] = None,
+        debounce: float = 0.1,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+        workers: Optional[int] = None,
+    ) -> None:
+        self.addons_set = addons_set
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.workers = workers
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._next_poll = time.monotonic() + poll_interval
+        self._inotify: Optional[_Inotify] = None
+        if use_inotify and inotify_available():
+            self._inotify = _Inotify()
+            try:
+                self._inotify.watch(addons_set._scanned_dirs())
+            except OSError as e:
+                # typically ENOSPC, when exceeding the max_user_watches limit
+                _logger.warning(f"cannot use inotify, polling instead: {e}")
+                self._inotify.close()
+                self._inotify = None
+            else:
+                self._wakeup_read, self._wakeup_write = os.pipe()
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether the directories are watched with inotify."""
+        return self._inotify is not None
+
+    def __enter__(self) -> "AddonsWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """Watch in a background thread, until :meth:`stop` is called."""
+        self._thread = threading.Thread(
+            target=self._run,
+            name="AddonsWatcher",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching, and release the resources of the watcher."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        if self._inotify is not None:
+            os.write(self._wakeup_write, b"\0")
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            os.close(self._wakeup_read)
+            os.close(self._wakeup_write)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:  # noqa: PERF203
+                _logger.exception("error refreshing the addons set")
+                # do not spin on persistent errors
+                self._stopped.wait(self.poll_interval)
+
+    def poll(self, timeout: Optional[float] = None) -> AddonsSetChanges:
+        """Wait for changes for at most ``timeout`` seconds, and apply them.
+
+        Return the changes, which are empty if nothing changed or the watcher was
+        stopped.
+        """
+        if not self._wait(timeout):
+            return AddonsSetChanges(added=set(), removed=set(), modified=set())
+        changes = self.addons_set.refresh(self.workers)
+        if self._inotify is not None:
+            self._inotify.watch(self.addons_set._scanned_dirs())
+        if self.callback is not None and any(changes):
+            self.callback(changes)
+        return changes
+
+    def _wait(self, timeout: Optional[float]) -> bool:
+        """Wait for changes, and return True if the set must be refreshed."""
+        if self._inotify is None:
+            delay = self._next_poll - time.monotonic()
+            if timeout is not None and delay > timeout:
+                self._stopped.wait(timeout)
+                return False
+            if self._stopped.wait(max(delay, 0)):
+                return False
+            self._next_poll = time.monotonic() + self.poll_interval
+            return True
+        if not self._select(self._inotify, timeout):
+            return False
+        deadline = time.monotonic() + self.debounce * _MAX_DEBOUNCE_DELAYS
+        while True:
+            self._inotify.read()
+            delay = min(self.debounce, deadline - time.monotonic())
+            if delay <= 0 or not self._select(self._inotify, delay):
+                break
+        return not self._stopped.is_set()
+
+    def _select(self, inotify: _Inotify, timeout: Optional[float]) -> bool:
+        """Wait for inotify events, and return True if there are some."""
+        readable, _, _ = select.select([inotify.fd, self._wakeup_read], [], [], timeout)
+        return inotify.fd in readable and not self._stopped.is_set()
@@ -0,0 +1,526 @@
+"""Dependency graph of the addons of an addons set."""
+
+import functools
+import operator
+from typing import (
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from .addon import Addon
+from .addons_set import AddonsSet
+from .core_addons import get_core_addons
+from .odoo_series import OdooSeries
+
+__all__ = ["DependencyGraph", "Reachability"]
+
+
+def _strongly_connected_components(
+    successors: List[List[int]],
+) -> List[List[int]]:
+    """Return the strongly connected components of a graph, with Tarjan's algorithm.
+
+    Nodes are integers indexing ``successors``. Components are returned in reverse
+    topological order: a component comes after all the components it has edges to.
+    """
+    count = len(successors)
+    index = [-1] * count
+    lowlink = [0] * count
+    on_stack = [False] * count
+    stack: List[int] = []
+    components: List[List[int]] = []
+    next_index = 0
+    for root in range(count):
+        if index[root] >= 0:
+            continue
+        # Iterative depth-first search, with the position in the successors of
+        # each node of the call stack.
+        work = [(root, 0)]
+        index[root] = lowlink[root] = next_index
+        next_index += 1
+        stack.append(root)
+        on_stack[root] = True
+        while work:
+            node, position = work[-1]
+            if position < len(successors[node]):
+                work[-1] = (node, position + 1)
+                successor = successors[node][position]
+                if index[successor] < 0:
+                    index[successor] = lowlink[successor] = next_index
+                    next_index += 1
+                    stack.append(successor)
+                    on_stack[successor] = True
+                    work.append((successor, 0))
+                elif on_stack[successor]:
+                    lowlink[node] = min(lowlink[node], index[successor])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+class DependencyGraph:
+    """The dependencies between the addons of an addons set.
+
+    The graph has a node for each addon of the addons set, and for each dependency
+    that is not in the addons set. The latter are core addons if ``odoo_series`` is
+    given and they are in :func:`~manifestoo_core.core_addons.get_core_addons`,
+    else missing. They have no dependencies, as their manifests are not known.
+
+    Transitive queries traverse the condensation of the graph into its strongly
+    connected components, which is computed once in linear time, so each query is
+    linear in the size of its result. Results are memoized, so repeating a query
+    costs a dictionary lookup, and later queries reuse them.
+
+    The graph follows the modifications of the addons set. When its
+    :attr:`~manifestoo_core.addons_set.AddonsSet.version` has changed, the next
+    query updates the edges of the added, removed and replaced addons, and
+    forgets only the memoized results of their ancestors and descendants, which
+    are the only ones that may have changed.
+    """
+
+    def __init__(
+        self,
+        addons_set: AddonsSet,
+        odoo_series: Optional[OdooSeries] = None,
+    ) -> None:
+        self._addons_set = addons_set
+        self._version = addons_set.version
+        self._addons: Dict[str, Addon] = dict(addons_set)
+        self._odoo_core_addons = frozenset(
+            get_core_addons(odoo_series) if odoo_series else ()
+        )
+        depends: Dict[str, FrozenSet[str]] = {
+            name: frozenset(addon.manifest.depends)
+            for name, addon in self._addons.items()
+        }
+        for dependencies in list(depends.values()):
+            for dependency in dependencies:
+                depends.setdefault(dependency, frozenset())
+        self._depends = depends
+        dependents: Dict[str, List[str]] = {name: [] for name in depends}
+        for name, dependencies in depends.items():
+            for dependency in dependencies:
+                dependents[dependency].append(name)
+        self._dependents = {
+            name: frozenset(names) for name, names in dependents.items()
+        }
+        # memoized closures, by member of the components
+        self._all_depends: Dict[str, FrozenSet[str]] = {}
+        self._all_dependents: Dict[str, FrozenSet[str]] = {}
+        self._condense()
+
+    def _condense(self) -> None:
+        """Compute the condensation of the graph, and the external nodes."""
+        names = list(self._depends)
+        ids = {name: i for i, name in enumerate(names)}
+        components = _strongly_connected_components(
+            [[ids[dependency] for dependency in self._depends[name]] for name in names],
+        )
+        self._component: Dict[str, int] = {}
+        self._members: List[FrozenSet[str]] = []
+        self._cyclic: List[bool] = []
+        for component, members in enumerate(components):
+            member_names = frozenset(names[member] for member in members)
+            for name in member_names:
+                self._component[name] = component
+            self._members.append(member_names)
+            first = names[members[0]]
+            self._cyclic.append(len(members) > 1 or first in self._depends[first])
+        self._component_depends = self._component_edges(self._depends)
+        self._component_dependents = self._component_edges(self._dependents)
+        external = frozenset(self._depends.keys() - self._addons.keys())
+        self._core_addons = external & self._odoo_core_addons
+        self._missing = external - self._odoo_core_addons
+
+    def _component_edges(
+        self,
+        edges: Mapping[str, Iterable[str]],
+    ) -> List[FrozenSet[int]]:
+        component_edges: List[FrozenSet[int]] = []
+        for component, members in enumerate(self._members):
+            component_edges.append(
+                frozenset(
+                    self._component[target]
+                    for name in members
+                    for target in edges[name]
+                )
+                - {component}
+            )
+        return component_edges
+
+    def _sync(self) -> None:
+        """Apply the modifications of the addons set since the last query."""
+        if self._addons_set.version == self._version:
+            return
+        addons = dict(self._addons_set)
+        changed = {
+            name
+            for name in self._addons.keys() | addons.keys()
+            if self._addons.get(name) is not addons.get(name)
+        }
+        new_depends = {
+            name: frozenset(addons[name].manifest.depends) if name in addons else None
+            for name in changed
+        }
+        changed = {
+            name
+            for name, dependencies in new_depends.items()
+            if dependencies != self._depends.get(name, frozenset())
+            # a new addon without dependencies, that is not a node yet
+            or (dependencies is not None and name not in self._depends)
+        }
+        self._addons = addons
+        self._version = self._addons_set.version
+        if not changed:
+            # only external nodes that became addons or conversely
+            self._condense()
+            return
+        # The ancestors of the changed nodes reach them through edges that did not
+        # change, so they are the same before and after the modifications, and
+        # their memoized dependencies are stale. The descendants of the changed
+        # nodes, before and after, have stale memoized dependents.
+        old_components = {self._component[n] for n in changed if n in self._depends}
+        ancestors = self._reachable(
+            old_components, self._component_dependents, self._all_dependents
+        )
+        descendants = self._reachable(
+            old_components, self._component_depends, self._all_depends
+        )
+        _forget(self._all_depends, ancestors | changed)
+        _forget(self._all_dependents, descendants | changed)
+        for name in changed:
+            self._set_depends(name, new_depends[name])
+        self._condense()
+        new_components = {self._component[n] for n in changed if n in self._depends}
+        _forget(
+            self._all_dependents,
+            self._reachable(new_components, self._component_depends, self._all_depends),
+        )
+
+    def _set_depends(self, name: str, depends: Optional[FrozenSet[str]]) -> None:
+        """Replace the dependencies of a node, None meaning that it is not an addon.
+
+        Nodes that are neither addons nor dependencies are removed.
+        """
+        old_depends = self._depends.get(name, frozenset())
+        new_depends = depends or frozenset()
+        for dependency in old_depends - new_depends:
+            self._dependents[dependency] -= {name}
+            self._remove_if_unused(dependency)
+        for dependency in new_depends - old_depends:
+            if dependency not in self._depends:
+                self._depends[dependency] = frozenset()
+                self._dependents[dependency] = frozenset()
+            self._dependents[dependency] |= {name}
+        if name not in self._depends:
+            self._dependents[name] = frozenset()
+        self._depends[name] = new_depends
+        if depends is None:
+            self._remove_if_unused(name)
+
+    def _remove_if_unused(self, name: str) -> None:
+        if (
+            name not in self._addons
+            and name in self._depends
+            and not self._dependents[name]
+            and not self._depends[name]
+        ):
+            del self._depends[name]
+            del self._dependents[name]
+
+    def _closure(
+        self,
+        component: int,
+        component_edges: List[FrozenSet[int]],
+        memo: Dict[str, FrozenSet[str]],
+    ) -> FrozenSet[str]:
+        """Return the names reachable from a component, memoizing the result."""
+        members = self._members[component]
+        closure = memo.get(next(iter(members)))
+        if closure is None:
+            names = self._reachable(component_edges[component], component_edges, memo)
+            if self._cyclic[component]:
+                names.update(members)
+            closure = frozenset(names)
+            for name in members:
+                memo[name] = closure
+        return closure
+
+    def _reachable(
+        self,
+        components: Iterable[int],
+        component_edges: List[FrozenSet[int]],
+        memo: Dict[str, FrozenSet[str]],
+    ) -> Set[str]:
+        """Return the names of components, and of the components reachable from them.
+
+        The condensation is traversed from the components, so the cost is linear in
+        the size of the reachable part of the graph. The traversal stops at
+        components whose closure is already known.
+        """
+        names: Set[str] = set()
+        seen: Set[int] = set()
+        stack = list(components)
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            members = self._members[current]
+            names.update(members)
+            known = memo.get(next(iter(members)))
+            if known is None:
+                stack.extend(component_edges[current])
+            else:
+                names.update(known)
+        return names
+
+    @property
+    def version(self) -> int:
+        """The :attr:`~manifestoo_core.addons_set.AddonsSet.version` of the addons
+        set that the graph reflects."""
+        self._sync()
+        return self._version
+
+    @property
+    def core_addons(self) -> FrozenSet[str]:
+        """The dependencies that are core addons, and are not in the addons set."""
+        self._sync()
+        return self._core_addons
+
+    @property
+    def missing(self) -> FrozenSet[str]:
+        """The dependencies that are neither in the addons set nor core addons."""
+        self._sync()
+        return self._missing
+
+    def __contains__(self, name: object) -> bool:
+        self._sync()
+        return name in self._depends
+
+    def __iter__(self) -> Iterator[str]:
+        self._sync()
+        return iter(self._depends)
+
+    def __len__(self) -> int:
+        self._sync()
+        return len(self._depends)
+
+    def depends(self, name: str) -> FrozenSet[str]:
+        """Return the direct dependencies of an addon.
+
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        self._sync()
+        return self._depends[name]
+
+    def dependents(self, name: str) -> FrozenSet[str]:
+        """Return the addons that directly depend on an addon.
+
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        self._sync()
+        return self._dependents[name]
+
+    def all_depends(self, name: str) -> FrozenSet[str]:
+        """Return the direct and indirect dependencies of an addon.
+
+        The addon itself is included only if it is part of a dependency cycle.
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        self._sync()
+        return self._closure(
+            self._component[name], self._component_depends, self._all_depends
+        )
+
+    def all_dependents(self, name: str) -> FrozenSet[str]:
+        """Return the addons that directly or indirectly depend on an addon.
+
+        The addon itself is included only if it is part of a dependency cycle.
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        self._sync()
+        return self._closure(
+            self._component[name], self._component_dependents, self._all_dependents
+        )
+
+    def missing_depends(self, name: str) -> FrozenSet[str]:
+        """Return the direct and indirect dependencies of an addon that are missing.
+
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        return self.all_depends(name) & self.missing
+
+    def impacted(
+        self,
+        changed: Iterable[str],
+        expand_core_addons: bool = False,
+    ) -> FrozenSet[str]:
+        """Return the addons of the addons set impacted by changes to some addons.
+
+        These are the changed addons, and the addons that depend on them, directly
+        or indirectly. Changed names that are not in the graph are ignored.
+
+        Changed core addons, according to the ``odoo_series`` of the graph, are
+        ignored too, unless ``expand_core_addons`` is True: changes to Odoo itself
+        would otherwise impact most addons.
+
+        The graph is traversed once from all the changed addons, so the cost is
+        linear in the size of the result.
+        """
+        self._sync()
+        components = {
+            self._component[name]
+            for name in changed
+            if name in self._component
+            and (expand_core_addons or name not in self._odoo_core_addons)
+        }
+        names = self._reachable(
+            components, self._component_dependents, self._all_dependents
+        )
+        return frozenset(names & self._addons.keys())
+
+
+def _forget(memo: Dict[str, FrozenSet[str]], names: Iterable[str]) -> None:
+    for name in names:
+        memo.pop(name, None)
+
+
+class Reachability:
+    """A compact reachability matrix of a dependency graph.
+
+    Each node of the graph gets an integer index in :attr:`names`, and the
+    transitive dependencies and dependents of each node are stored as Python
+    integers, in which bit ``i`` is set for the node of index ``i``. They are
+    computed once for all nodes, by traversing the strongly connected components
+    of the graph in topological order, and each node of a component shares the
+    integers of its component.
+
+    Testing whether an addon depends on another is then a bit test, and the set
+    algebra on dependencies of many addons is done on integers, without iterating
+    over the nodes. For instance, the dependencies shared by all the addons of a
+    deployment are ``reachability.names_of(reachability.common_depends(addons))``.
+    """
+
+    def __init__(self, graph: DependencyGraph) -> None:
+        graph._sync()
+        self.version = graph._version
+        "The version of the addons set that the matrix reflects."
+        self.names: Tuple[str, ...] = tuple(graph)
+        "The names of the nodes, by index."
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        "The indexes of the nodes, by name."
+        members = [self.mask(names) for names in graph._members]
+        self._depends = self._closures(
+            graph,
+            members,
+            graph._component_depends,
+            range(len(members)),
+        )
+        self._dependents = self._closures(
+            graph,
+            members,
+            graph._component_dependents,
+            reversed(range(len(members))),
+        )
+        self._component = [0] * len(self.names)
+        for name, component in graph._component.items():
+            self._component[self.index[name]] = component
+
+    @staticmethod
+    def _closures(
+        graph: DependencyGraph,
+        members: List[int],
+        component_edges: List[FrozenSet[int]],
+        components: Iterable[int],
+    ) -> List[int]:
+        """Return the closure of each component, as bitmasks.
+
+        ``components`` must list each component after all the components it has
+        edges to, so their closures are known when it is reached.
+        """
+        closures = [0] * len(members)
+        for component in components:
+            closure = members[component] if graph._cyclic[component] else 0
+            for target in component_edges[component]:
+                closure |= members[target] | closures[target]
+            closures[component] = closure
+        return closures
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def mask(self, names: Iterable[str]) -> int:
+        """Return the bitmask of nodes.
+
+        Raise :class:`KeyError` if a node is not in the graph.
+        """
+        mask = 0
+        for name in names:
+            mask |= 1 << self.index[name]
+        return mask
+
+    def names_of(self, mask: int) -> List[str]:
+        """Return the names of the nodes of a bitmask, by index."""
+        names = []
+        while mask:
+            low_bit = mask & -mask
+            names.append(self.names[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return names
+
+    def depends(self, name: str) -> int:
+        """Return the bitmask of the direct and indirect dependencies of an addon.
+
+        As with :meth:`DependencyGraph.all_depends`, the addon itself is included
+        only if it is part of a dependency cycle.
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        return self._depends[self._component[self.index[name]]]
+
+    def dependents(self, name: str) -> int:
+        """Return the bitmask of the addons that depend on an addon, indirectly or not.
+
+        Raise :class:`KeyError` if the addon is not in the graph.
+        """
+        return self._dependents[self._component[self.index[name]]]
+
+    def depends_on(self, name: str, dependency: str) -> bool:
+        """Return True if an addon directly or indirectly depends on another.
+
+        Raise :class:`KeyError` if an addon is not in the graph.
+        """
+        return bool(self.depends(name) >> self.index[dependency] & 1)
+
+    def union_depends(self, names: Iterable[str]) -> int:
+        """Return the bitmask of the dependencies of any of the addons."""
+        return functools.reduce(operator.or_, map(self.depends, names), 0)
+
+    def common_depends(self, names: Iterable[str]) -> int:
+        """Return the bitmask of the dependencies shared by all the addons.
+
+        Return 0 if there are no addons.
+        """
+        masks = list(map(self.depends, names))
+        if not masks:
+            return 0
+        return functools.reduce(operator.and_, masks)
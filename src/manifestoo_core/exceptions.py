@@ -1,3 +1,6 @@
+from typing import List
+
+
 class ManifestooException(Exception):  # noqa: N818
     """Base class of all manifestoo_core exceptions."""
 
@@ -42,6 +45,22 @@ class AddonNotFoundInvalidManifest(AddonNotFound):
     pass
 
 
+class DependencyCycle(ManifestooException):
+    """Addons depend on each other, so they cannot be ordered.
+
+    ``cycles`` holds the names of the addons of each cycle, that is each strongly
+    connected component of the dependency graph with more than one addon, or with
+    an addon depending on itself.
+    """
+
+    def __init__(self, cycles: List[List[str]]) -> None:
+        self.cycles = cycles
+        super().__init__(
+            "dependency cycles between addons: "
+            + "; ".join(", ".join(cycle) for cycle in cycles)
+        )
+
+
 class InvalidDistributionName(ManifestooException):
     pass
 
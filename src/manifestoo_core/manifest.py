@@ -1,13 +1,38 @@
-import ast
+import sys
+from concurrent.futures import Executor
+from copy import deepcopy
+from functools import partial
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from .exceptions import InvalidManifest
+from .manifest_cache import get_manifest_cache
+from .manifest_parser import ManifestParser, parse_manifest_literal
 
 T = TypeVar("T")
 VT = TypeVar("VT")
 
-__all__ = ["MANIFEST_NAMES", "InvalidManifest", "Manifest", "get_manifest_path"]
+__all__ = [
+    "MANIFEST_NAMES",
+    "CompactManifest",
+    "CompiledManifest",
+    "InvalidManifest",
+    "Manifest",
+    "ManifestParser",
+    "get_manifest_path",
+]
 
 MANIFEST_NAMES = ("__manifest__.py", "__openerp__.py", "__terp__.py")
 
@@ -58,6 +83,25 @@ def _check_external_dependencies(value: Any) -> Dict[str, Any]:
     return _check_dict(value, key_checker=_check_str)
 
 
+# Type checkers of the known manifest keys.
+_KEY_CHECKERS: Dict[str, Callable[[Any], Any]] = {
+    "name": _check_optional_str,
+    "summary": _check_optional_str,
+    "description": _check_optional_str,
+    "version": _check_optional_str,
+    "installable": _check_bool,
+    "depends": _check_list_of_str,
+    "external_dependencies": _check_external_dependencies,
+    "license": _check_optional_str,
+    "author": _check_optional_str,
+    "category": _check_optional_str,
+    "website": _check_optional_str,
+    "development_status": _check_optional_str,
+}
+_KEY_INDEX = {key: index for index, key in enumerate(_KEY_CHECKERS)}
+_MISSING: Any = object()
+
+
 def get_manifest_path(addon_dir: Path) -> Optional[Path]:
     """Get the path to the manifest file for an addon directory.
 
@@ -73,6 +117,8 @@ def get_manifest_path(addon_dir: Path) -> Optional[Path]:
 class Manifest:
     """Represent an Odoo manifest file."""
 
+    __slots__ = ("manifest_dict",)
+
     def __init__(self, manifest_dict: Dict[str, Any]) -> None:
         """Do not use this contructor, use the from_* classmethods instead."""
         self.manifest_dict = manifest_dict
@@ -184,23 +230,272 @@ class Manifest:
         return cls(manifest_dict)
 
     @classmethod
-    def from_str(cls, manifest_str: str, source: str = "<manifest>") -> "Manifest":
+    def from_str(
+        cls,
+        manifest_str: str,
+        source: str = "<manifest>",
+        parser: ManifestParser = ManifestParser.FAST,
+        keys: Optional[Collection[str]] = None,
+    ) -> "Manifest":
         """Parse a manifest string into a :class:`Manifest` object.
 
+        ``parser`` selects the parser engine. Both engines give the same result.
+
+        If ``keys`` is given, only these keys are loaded and the others behave as if
+        they were absent from the manifest. This is faster when only a few keys are
+        needed.
+
         Raises :class:`InvalidManifest` if the manifest is invalid.
         """
         try:
-            manifest_dict = ast.literal_eval(manifest_str)
+            manifest_dict = parse_manifest_literal(manifest_str, parser, keys)
         except SyntaxError as e:
             msg = f"Manifest {source} has invalid syntax"
             raise InvalidManifest(msg) from e
         return cls.from_dict(manifest_dict)
 
     @classmethod
-    def from_file(cls, manifest_path: Path) -> "Manifest":
+    def from_file(
+        cls,
+        manifest_path: Path,
+        parser: ManifestParser = ManifestParser.FAST,
+        keys: Optional[Collection[str]] = None,
+    ) -> "Manifest":
         """Parse a manifest file into a :class:`Manifest` object.
 
+        See :meth:`from_str` for the meaning of ``parser`` and ``keys``. If a
+        :class:`~manifestoo_core.manifest_cache.ManifestCache` is installed, it is
+        used to avoid reading and parsing unchanged files.
+
         Raises :class:`InvalidManifest` if the manifest is invalid.
         """
-        manifest_str = manifest_path.read_text()
-        return cls.from_str(manifest_str, source=f"{manifest_path!r}")
+        cache = get_manifest_cache()
+        if cache is None:
+            manifest_str = manifest_path.read_text()
+            return cls.from_str(
+                manifest_str,
+                source=f"{manifest_path!r}",
+                parser=parser,
+                keys=keys,
+            )
+        try:
+            manifest_dict = cache.load(manifest_path, parser)
+        except SyntaxError as e:
+            msg = f"Manifest {manifest_path!r} has invalid syntax"
+            raise InvalidManifest(msg) from e
+        if keys is not None and isinstance(manifest_dict, dict):
+            manifest_dict = {k: v for k, v in manifest_dict.items() if k in keys}
+        return cls.from_dict(manifest_dict)
+
+    @classmethod
+    def from_files(
+        cls,
+        manifest_paths: Iterable[Path],
+        executor: Optional[Executor] = None,
+        chunksize: int = 64,
+        parser: ManifestParser = ManifestParser.FAST,
+        keys: Optional[Collection[str]] = None,
+    ) -> List[Union["Manifest", Exception]]:
+        """Parse several manifest files.
+
+        Return, in the order of ``manifest_paths``, a :class:`Manifest` object for
+        each file, or the :class:`InvalidManifest` or :class:`OSError` exception
+        raised while loading it.
+
+        If ``executor`` is given, typically a
+        :class:`~concurrent.futures.ProcessPoolExecutor`, files are read and parsed
+        by the executor in chunks of ``chunksize`` paths. Only the parsed
+        dictionaries are sent back. See :meth:`from_str` for the meaning of
+        ``parser`` and ``keys``.
+        """
+        manifest_paths = list(manifest_paths)
+        load = partial(_load_manifest_dicts, parser=parser, keys=keys)
+        if executor is None:
+            results = load(manifest_paths)
+        else:
+            chunks = [
+                manifest_paths[i : i + chunksize]
+                for i in range(0, len(manifest_paths), chunksize)
+            ]
+            results = [
+                result
+                for chunk_results in executor.map(load, chunks)
+                for result in chunk_results
+            ]
+        manifests: List[Union[Manifest, Exception]] = []
+        for result in results:
+            if isinstance(result, Exception):
+                manifests.append(result)
+                continue
+            try:
+                manifests.append(cls(result))
+            except InvalidManifest as e:
+                manifests.append(e)
+        return manifests
+
+    def compile(self) -> "CompiledManifest":
+        """Validate this manifest into a :class:`CompiledManifest`.
+
+        Raises :class:`InvalidManifest` if a known key has an invalid type.
+        """
+        return CompiledManifest(self.manifest_dict)
+
+
+class CompiledManifest(Manifest):
+    """An immutable :class:`Manifest`, with all known keys validated at creation.
+
+    Known keys are stored in a tuple, so accessing them does not involve type checks.
+    Other keys remain available in :attr:`manifest_dict`, which is rebuilt on
+    access. The from_* classmethods raise :class:`InvalidManifest` if any known key
+    has an invalid type.
+
+    Values are frozen once at creation: lists are stored as tuples, and
+    dictionaries as read-only mappings, recursively. Lists such as :attr:`depends`
+    are returned as new lists, and dictionaries such as
+    :attr:`external_dependencies` as read-only mappings whose lists are tuples,
+    without copying them. So neither the source dictionary nor the returned values
+    can modify the manifest. :attr:`manifest_dict` returns mutable copies.
+    """
+
+    __slots__ = ("_extra", "_values")
+
+    _values: Tuple[Any, ...]
+    _extra: Optional[Dict[str, Any]]
+
+    def __init__(self, manifest_dict: Dict[str, Any]) -> None:
+        """Do not use this contructor, use the from_* classmethods instead."""
+        values = [_MISSING] * len(_KEY_INDEX)
+        extra = {}
+        for key, value in manifest_dict.items():
+            index = _KEY_INDEX.get(key)
+            if index is None:
+                extra[key] = value
+                continue
+            try:
+                values[index] = _freeze_value(_KEY_CHECKERS[key](value))
+            except TypeError as e:
+                msg = f"{value!r} has invalid type for {key!r} in {self}"
+                raise InvalidManifest(msg) from e
+        object.__setattr__(self, "_values", tuple(values))
+        object.__setattr__(self, "_extra", deepcopy(extra) or None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        msg = f"{self.__class__.__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __delattr__(self, name: str) -> None:
+        msg = f"{self.__class__.__name__} is immutable"
+        raise AttributeError(msg)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (self.__class__, (self.manifest_dict,))
+
+    @property
+    def manifest_dict(self) -> Dict[str, Any]:  # type: ignore[override]
+        """A new dictionary with all the keys of the manifest."""
+        manifest_dict = {
+            key: _thaw_value(value)
+            for key, value in zip(_KEY_INDEX, self._values)
+            if value is not _MISSING
+        }
+        if self._extra:
+            manifest_dict.update(deepcopy(self._extra))
+        return manifest_dict
+
+    def _get(self, key: str, checker: Callable[[Any], T], default: T) -> T:
+        """Get value, validated at creation for known keys."""
+        index = _KEY_INDEX.get(key)
+        if index is None:
+            # not a known key, check it now
+            return deepcopy(Manifest(self._extra or {})._get(key, checker, default))
+        value = self._values[index]
+        if value is _MISSING:
+            return default
+        if type(value) is tuple:
+            # a list, whose items are frozen
+            value = list(value)
+        return value  # type: ignore[no-any-return]
+
+
+def _freeze_value(value: Any) -> Any:
+    """Return an immutable copy of a value.
+
+    Lists become tuples, and dictionaries read-only mappings, recursively.
+    """
+    if isinstance(value, list):
+        return tuple(map(_freeze_value, value))
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze_value(v) for k, v in value.items()})
+    return value
+
+
+def _thaw_value(value: Any) -> Any:
+    """Return a mutable copy of a value frozen by :func:`_freeze_value`."""
+    if type(value) is tuple:
+        return list(map(_thaw_value, value))
+    if type(value) is MappingProxyType:
+        return {k: _thaw_value(v) for k, v in value.items()}
+    return value
+
+
+def _compact_value(value: Any) -> Any:
+    """Intern strings, and the strings of tuples of strings."""
+    if type(value) is str:
+        return sys.intern(value)
+    if type(value) is tuple and all(type(item) is str for item in value):
+        return tuple(map(sys.intern, value))
+    return value
+
+
+class CompactManifest(CompiledManifest):
+    """A :class:`CompiledManifest` using as little memory as possible.
+
+    The keys of :attr:`dropped_keys`, such as the description and the data files,
+    are not kept. Strings are interned, so that values repeated across manifests,
+    such as dependency names, authors or licenses, are stored once.
+    """
+
+    __slots__ = ()
+
+    dropped_keys = frozenset(("description", "data", "demo", "qweb", "assets"))
+    "The keys that compact manifests do not keep."
+
+    def __init__(self, manifest_dict: Dict[str, Any]) -> None:
+        """Do not use this contructor, use the from_* classmethods instead."""
+        super().__init__(
+            {
+                key: value
+                for key, value in manifest_dict.items()
+                if key not in self.dropped_keys
+            }
+        )
+        object.__setattr__(self, "_values", tuple(map(_compact_value, self._values)))
+
+    @property
+    def manifest_dict(self) -> Dict[str, Any]:  # type: ignore[override]
+        """A new dictionary with the keys of the manifest that were kept."""
+        return super().manifest_dict
+
+
+def _load_manifest_dicts(
+    manifest_paths: List[Path],
+    parser: ManifestParser,
+    keys: Optional[Collection[str]],
+) -> List[Union[Dict[str, Any], Exception]]:
+    """Load manifest files, returning the manifest dictionary or error for each."""
+    results: List[Union[Dict[str, Any], Exception]] = []
+    for manifest_path in manifest_paths:
+        try:
+            manifest = Manifest.from_file(manifest_path, parser, keys)
+        except (InvalidManifest, OSError) as e:  # noqa: PERF203
+            results.append(e)
+        except ValueError as e:
+            # Not a literal (e.g. a name) or not UTF-8 encoded: do not let one bad
+            # file abort the whole batch.
+            msg = f"Manifest {manifest_path!r} is invalid: {e}"
+            error = InvalidManifest(msg)
+            error.__cause__ = e
+            results.append(error)
+        else:
+            results.append(manifest.manifest_dict)
+    return results
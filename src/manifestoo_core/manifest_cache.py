@@ -0,0 +1,216 @@
+"""Persistent cache of parsed manifests.
+
+When a :class:`ManifestCache` is installed with :func:`set_manifest_cache`,
+:meth:`Manifest.from_file <manifestoo_core.manifest.Manifest.from_file>`, and
+therefore :meth:`Addon.from_addon_dir <manifestoo_core.addon.Addon.from_addon_dir>`,
+obtain parsed manifests from the cache when the manifest file has not changed.
+"""
+
+import hashlib
+import io
+import marshal
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from .manifest_parser import ManifestParser, parse_manifest_literal
+
+__all__ = [
+    "ManifestCache",
+    "StatSignature",
+    "get_manifest_cache",
+    "set_manifest_cache",
+    "stat_signature",
+]
+
+StatSignature = Tuple[int, int, int]
+"""The modification time in nanoseconds, size and inode number of a file."""
+
+# Entries are marked as used at most once per interval, to avoid a database write
+# on each cache hit.
+_TOUCH_INTERVAL = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS manifests (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    data BLOB NOT NULL,
+    used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS manifests_used ON manifests (used);
+"""
+
+
+def stat_signature(path: Path) -> Optional[StatSignature]:
+    """Return the stat signature of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def _decode(data: bytes) -> str:
+    # Same as Path.read_text(), with the default encoding and universal newlines.
+    return io.TextIOWrapper(io.BytesIO(data)).read()
+
+
+class ManifestCache:
+    """A persistent cache of parsed manifests, stored in an sqlite database.
+
+    Entries are keyed by the absolute manifest path, and are valid as long as the
+    stat signature of the file is unchanged. When it changes but the file content
+    is the same (according to a hash), the entry is revalidated without parsing.
+    The database is safe to share between several processes. When it holds more
+    than ``max_entries`` manifests, the least recently used ones are evicted.
+
+    The cache stores manifests with :mod:`marshal`, so the database must not come
+    from an untrusted source.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        max_entries: int = 20000,
+        timeout: float = 30.0,
+    ) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._inserts = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not be shared with forked processes.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                str(self.path),
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def close(self) -> None:
+        """Evict old entries if needed, and close the database."""
+        with self._lock:
+            if self._connection is None or self._pid != os.getpid():
+                return
+            self._evict()
+            self._connection.close()
+            self._connection = None
+
+    def __enter__(self) -> "ManifestCache":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._connect().execute("DELETE FROM manifests")
+
+    def load(
+        self,
+        manifest_path: Path,
+        parser: ManifestParser = ManifestParser.FAST,
+    ) -> Any:
+        """Return the parsed content of a manifest file.
+
+        The file is neither read nor parsed if the cache has a valid entry for it.
+        Parsing errors are raised as by
+        :func:`~manifestoo_core.manifest_parser.parse_manifest_literal`.
+        """
+        key = os.path.abspath(manifest_path)
+        signature = stat_signature(manifest_path)
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT mtime_ns, size, inode, digest, data, used "
+                    "FROM manifests WHERE path = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        now = int(time.time())
+        if row is not None and signature is not None and tuple(row[:3]) == signature:
+            if row[5] < now - _TOUCH_INTERVAL:
+                self._execute("UPDATE manifests SET used = ? WHERE path = ?", now, key)
+            return marshal.loads(row[4])  # noqa: S302
+        data = manifest_path.read_bytes()
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if row is not None and row[3] == digest and signature is not None:
+            # touched but unchanged
+            self._execute(
+                "UPDATE manifests SET mtime_ns = ?, size = ?, inode = ?, used = ? "
+                "WHERE path = ?",
+                *signature,
+                now,
+                key,
+            )
+            return marshal.loads(row[4])  # noqa: S302
+        manifest = parse_manifest_literal(_decode(data), parser)
+        try:
+            marshaled = marshal.dumps(manifest)
+        except ValueError:  # pragma: no cover
+            return manifest
+        if signature is not None:
+            self._execute(
+                "INSERT OR REPLACE INTO manifests VALUES (?, ?, ?, ?, ?, ?, ?)",
+                key,
+                *signature,
+                digest,
+                marshaled,
+                now,
+            )
+            self._inserts += 1
+            if self._inserts > self.max_entries // 10:
+                with self._lock:
+                    self._evict()
+        return manifest
+
+    def _execute(self, sql: str, *params: Any) -> None:
+        with self._lock:
+            self._connect().execute(sql, params)
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries above max_entries."""
+        self._inserts = 0
+        self._connect().execute(
+            "DELETE FROM manifests WHERE path IN ("
+            "  SELECT path FROM manifests ORDER BY used DESC LIMIT -1 OFFSET ?"
+            ")",
+            (self.max_entries,),
+        )
+
+
+_manifest_cache: Optional[ManifestCache] = None
+
+
+def set_manifest_cache(cache: Optional[ManifestCache]) -> None:
+    """Install the manifest cache used when loading manifest files.
+
+    Use None to disable caching, which is the default.
+    """
+    global _manifest_cache  # noqa: PLW0603
+    _manifest_cache = cache
+
+
+def get_manifest_cache() -> Optional[ManifestCache]:
+    """Return the installed manifest cache, if any."""
+    return _manifest_cache
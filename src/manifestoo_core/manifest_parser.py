@@ -0,0 +1,282 @@
+"""Fast parser for Odoo manifest literals.
+
+Odoo manifests are Python dictionary literals. :func:`ast.literal_eval` parses them
+correctly but builds a complete abstract syntax tree first, which is costly for
+manifests with long descriptions. This module parses the literals found in practice
+(dicts, lists, tuples, strings, numbers, booleans and ``None``) directly into Python
+objects, and falls back to :func:`ast.literal_eval` for anything else, so the result
+and the errors raised are the same with both engines.
+"""
+
+import ast
+import re
+from contextlib import suppress
+from enum import Enum
+from typing import Any, Collection, List, Optional
+
+__all__ = ["ManifestParser", "parse_manifest_literal"]
+
+
+class ManifestParser(str, Enum):
+    """Enum representing the available manifest parser engines."""
+
+    FAST = "fast"
+    AST = "ast"
+
+
+class _UnsupportedSyntax(Exception):  # noqa: N818
+    """Raised by the fast parser on input it does not handle."""
+
+
+# Each match is one token preceded by optional whitespace, with the token in one of
+# the groups: string start, punctuation, number, name, or any other character. All
+# groups are empty at the end of the input.
+_TOKEN_RE = re.compile(
+    r"""
+    (?:[ \t\f\r\n]+|\#[^\r\n]*)*
+    (?:
+        ([rRuUbBfF]{0,2}(?:'''|\"\"\"|'|"))
+        |([][{}():,])
+        |([-+]?[ \t\f]*(?:[0-9]|\.[0-9])(?:[0-9a-zA-Z_.]|(?<=[eE])[+-])*)
+        |([a-zA-Z_][a-zA-Z0-9_]*)
+        |(.)
+    )?
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+# Whitespace and comments.
+_SPACE_RE = re.compile(r"(?:[ \t\f\r\n]+|#[^\r\n]*)*")
+_NAMES = {"True": True, "False": False, "None": None}
+# Escape sequences that may be invalid, so strings containing them are always decoded.
+_CHECKED_ESCAPE_RE = re.compile(r"\\[xuUN]")
+# Backslashes that do not start an escape sequence of str literals.
+_INVALID_ESCAPE_RE = re.compile(r"\\(?![\n\\'\"abfnrtv0-7xNuU])")
+_NO_KEY = object()
+
+# What the parser expects next.
+_ITEM = 0  # a value, or a closing bracket
+_VALUE = 1  # a value
+_COLON = 2  # a colon, after a dict key
+_SEPARATOR = 3  # a comma, or a closing bracket
+_END = 4  # the end of the input
+
+
+def _token_value(token: str) -> Any:
+    """Evaluate a single scalar token that has no fast path."""
+    try:
+        return ast.literal_eval(token)
+    except (SyntaxError, ValueError) as e:
+        raise _UnsupportedSyntax from e
+
+
+def _string_end(source: str, delimiter: str, start: int) -> int:
+    """Return the position of the delimiter ending a string body."""
+    pos = start
+    while True:
+        end = source.find(delimiter, pos)
+        if end < 0:
+            raise _UnsupportedSyntax
+        # The delimiter is escaped if preceded by an odd number of backslashes.
+        backslash = end
+        while backslash > start and source[backslash - 1] == "\\":
+            backslash -= 1
+        if (end - backslash) % 2 == 0:
+            return end
+        pos = end + 1
+
+
+def _string_value(token: str, prefix: str, body: str) -> Any:
+    if prefix not in ("", "u", "U"):
+        return _token_value(token)
+    if "\\" not in body and "\r" not in body:
+        return body
+    if "\r" in body or _INVALID_ESCAPE_RE.search(body):
+        # Python converts newlines and warns about invalid escape sequences.
+        return _token_value(token)
+    # Characters outside latin-1 are turned into escape sequences, and latin-1
+    # characters are decoded as is by the unicode_escape codec.
+    return body.encode("latin-1", "backslashreplace").decode("unicode_escape")
+
+
+def _number_value(number: str) -> Any:
+    sign = number[0]
+    if sign in "+-":
+        number = number[1:].lstrip(" \t\f")
+    if number.isdigit() and (number[0] != "0" or number == "0"):
+        value = int(number)
+    else:
+        value = _token_value(number)
+    return -value if sign == "-" else value
+
+
+def _add_value(stack: List[List[Any]], value: Any) -> int:
+    """Add a value to the innermost container, and return what is expected next."""
+    frame = stack[-1]
+    if frame[0] == "}":
+        if frame[2] is _NO_KEY:
+            frame[2] = value
+            return _COLON
+        frame[1][frame[2]] = value
+        frame[2] = _NO_KEY
+    else:
+        frame[1].append(value)
+    return _SEPARATOR
+
+
+def _parse_fast(  # noqa: C901, PLR0912, PLR0915
+    source: str,
+    keys: Optional[Collection[str]] = None,
+) -> Any:
+    if "\0" in source:
+        # Python refuses null bytes in source code.
+        raise _UnsupportedSyntax
+    start = _SPACE_RE.match(source).end()  # type: ignore[union-attr]
+    if source[:start].strip(" \t") and source[start - 1] not in "\r\n":
+        # Python would raise an IndentationError.
+        raise _UnsupportedSyntax
+    stripped = source.rstrip(" \t")
+    if len(stripped) != len(source) and stripped.endswith(("\n", "\r")):
+        # Python would raise an IndentationError for the indented last line.
+        raise _UnsupportedSyntax
+    # Each frame is [closing bracket, container, pending dict key, has comma].
+    stack: List[List[Any]] = []
+    expect = _ITEM
+    result: Any = None
+    string: Any = None
+    match_token = _TOKEN_RE.match
+    pos = 0
+    while True:
+        match = match_token(source, pos)
+        if not match:  # pragma: no cover
+            # the token pattern matches at any position
+            raise _UnsupportedSyntax
+        pos = match.end()
+        string_start, punctuation, number, name, other = match.groups()
+        if string_start:
+            delimiter = string_start.lstrip("rRuUbBfF")
+            end = _string_end(source, delimiter, pos)
+            body = source[pos:end]
+            if len(delimiter) == 1 and ("\n" in body or "\r" in body):
+                raise _UnsupportedSyntax
+            token_start = pos - len(string_start)
+            pos = end + len(delimiter)
+            prefix = string_start[: -len(delimiter)]
+            if (
+                keys is not None
+                and stack
+                and stack[0][0] == "}"
+                and stack[0][2] is not _NO_KEY
+                and stack[0][2] not in keys
+                and prefix.lower() in ("", "u", "r", "b", "br", "rb")
+                and not _CHECKED_ESCAPE_RE.search(body)
+                # bytes can only contain ASCII characters
+                and ("b" not in prefix.lower() or body.isascii())
+            ):
+                # Part of the value of a top level key that is not requested: do
+                # not decode it, it will be dropped.
+                value: Any = b"" if "b" in prefix.lower() else ""
+            else:
+                value = _string_value(source[token_start:pos], prefix, body)
+            if string is not None:
+                # Implicit concatenation of adjacent strings. Outside brackets,
+                # they may be separated by a newline which Python rejects.
+                if type(value) is not type(string) or not stack:
+                    raise _UnsupportedSyntax
+                string += value
+            elif expect > _VALUE:
+                raise _UnsupportedSyntax
+            else:
+                string = value
+            continue
+        if string is not None:
+            if stack:
+                expect = _add_value(stack, string)
+            else:
+                result, expect = string, _END
+            string = None
+        if punctuation:
+            if punctuation == ",":
+                if expect != _SEPARATOR or not stack:
+                    raise _UnsupportedSyntax
+                stack[-1][3] = True
+                expect = _ITEM
+                continue
+            if punctuation == ":":
+                if expect != _COLON:
+                    raise _UnsupportedSyntax
+                expect = _VALUE
+                continue
+            if punctuation in "{[(":
+                if expect > _VALUE:
+                    raise _UnsupportedSyntax
+                if punctuation == "{":
+                    stack.append(["}", {}, _NO_KEY, False])
+                else:
+                    close = "]" if punctuation == "[" else ")"
+                    stack.append([close, [], _NO_KEY, False])
+                expect = _ITEM
+                continue
+            if (
+                not stack
+                or expect not in (_ITEM, _SEPARATOR)
+                or punctuation != stack[-1][0]
+                or stack[-1][2] is not _NO_KEY
+            ):
+                raise _UnsupportedSyntax
+            frame = stack.pop()
+            value = frame[1]
+            if punctuation == ")":
+                value = tuple(value) if frame[3] or not value else value[0]
+        elif number:
+            if expect > _VALUE:
+                raise _UnsupportedSyntax
+            value = _number_value(number)
+        elif name in _NAMES:
+            if expect > _VALUE:
+                raise _UnsupportedSyntax
+            value = _NAMES[name]
+        elif name or other:
+            raise _UnsupportedSyntax
+        else:
+            break
+        if stack:
+            expect = _add_value(stack, value)
+        else:
+            result, expect = value, _END
+    if string is not None and not stack:
+        result, expect = string, _END
+    if expect != _END:
+        raise _UnsupportedSyntax
+    if keys is not None:
+        return _select_keys(result, keys)
+    return result
+
+
+def _select_keys(value: Any, keys: Collection[str]) -> Any:
+    if not isinstance(value, dict):
+        return value
+    return {key: item for key, item in value.items() if key in keys}
+
+
+def parse_manifest_literal(
+    source: str,
+    parser: ManifestParser = ManifestParser.FAST,
+    keys: Optional[Collection[str]] = None,
+) -> Any:
+    """Evaluate the Python literal contained in a manifest source string.
+
+    With the ``FAST`` parser, anything the fast parser does not handle is delegated to
+    :func:`ast.literal_eval`, so the result and the exceptions raised are the same as
+    with the ``AST`` parser.
+
+    If ``keys`` is given and the literal is a dictionary, only these keys are
+    returned. The ``FAST`` parser then checks the syntax of the values of other keys
+    but does not build them.
+    """
+    if parser == ManifestParser.FAST:
+        with suppress(_UnsupportedSyntax, TypeError, ValueError, RecursionError):
+            return _parse_fast(source, keys)
+    value = ast.literal_eval(source)
+    if keys is not None:
+        return _select_keys(value, keys)
+    return value
@@ -1,15 +1,17 @@
 """Odoo Series and Editions."""
 
 from enum import Enum
-from typing import Optional, Set
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set
 
-from .addons_set import AddonsSet
+from .addons_set import AddonsSet, iter_addons
 from .exceptions import UnsupportedOdooSeries
 
 __all__ = [
     "OdooEdition",
     "OdooSeries",
     "detect_from_addon_version",
+    "detect_from_addons_dirs",
     "detect_from_addons_set",
 ]
 
@@ -70,6 +72,11 @@ def detect_from_addon_version(version: str) -> Optional[OdooSeries]:
 
 
 def detect_from_addons_set(addons_set: AddonsSet) -> Set[OdooSeries]:
+    """Detect the Odoo Series of the addons in a set, from their versions.
+
+    Only the ``version`` manifest key is used, so the set may be loaded with
+    ``manifest_keys=["version"]``.
+    """
     detected: Set[OdooSeries] = set()
     for addon in addons_set.values():
         addon_version = addon.manifest.version
@@ -80,3 +87,49 @@ def detect_from_addons_set(addons_set: AddonsSet) -> Set[OdooSeries]:
             continue
         detected.add(addon_series)
     return detected
+
+
+def detect_from_addons_dirs(
+    addons_dirs: Iterable[Path],
+    stop_after: Optional[int] = None,
+) -> Dict[OdooSeries, int]:
+    """Detect the Odoo Series of the addons in directories, from their versions.
+
+    Return the number of installable addons of each detected series. Addons are
+    loaded one at a time with :func:`~manifestoo_core.addons_set.iter_addons`,
+    parsing only the ``version`` and ``installable`` manifest keys, and no
+    addons set is built.
+
+    An addon found in several directories is counted once, with its last copy, as
+    in an addons set built from the same directories.
+
+    If ``stop_after`` is given, the directories are not scanned further once that
+    many addons of the same series were found, and no addon of another series:
+    the result then has only that series.
+    """
+    counts: Dict[OdooSeries, int] = {}
+    # the series counted for each addon name, to replace it with later copies
+    counted: Dict[str, Optional[OdooSeries]] = {}
+    for addon in iter_addons(addons_dirs, manifest_keys=["version"]):
+        addon_version = addon.manifest.version
+        addon_series = (
+            detect_from_addon_version(addon_version) if addon_version else None
+        )
+        previous_series = counted.get(addon.name)
+        counted[addon.name] = addon_series
+        if previous_series == addon_series:
+            continue
+        if previous_series is not None:
+            counts[previous_series] -= 1
+            if not counts[previous_series]:
+                del counts[previous_series]
+        if not addon_series:
+            continue
+        counts[addon_series] = counts.get(addon_series, 0) + 1
+        if (
+            stop_after is not None
+            and len(counts) == 1
+            and counts[addon_series] >= stop_after
+        ):
+            break
+    return counts
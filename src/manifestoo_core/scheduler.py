@@ -0,0 +1,182 @@
+"""Run a function on the addons of an addons set, in dependency order."""
+
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .addon import Addon
+from .addons_set import AddonsSet
+from .dependency_graph import _strongly_connected_components
+from .exceptions import DependencyCycle
+
+__all__ = ["ScheduleResult", "run_in_dependency_order", "topological_levels"]
+
+
+class _Order(NamedTuple):
+    depends: Dict[str, List[str]]
+    """The dependencies of each addon that are in the addons set."""
+    dependents: Dict[str, List[str]]
+    """The addons of the addons set that depend on each addon."""
+    levels: List[List[str]]
+
+
+def _order(addons_set: AddonsSet) -> _Order:
+    """Order the addons of an addons set, raising DependencyCycle on cycles."""
+    depends = {
+        name: sorted({d for d in addon.manifest.depends if d in addons_set})
+        for name, addon in addons_set.items()
+    }
+    names = sorted(depends)
+    ids = {name: i for i, name in enumerate(names)}
+    components = _strongly_connected_components(
+        [[ids[dependency] for dependency in depends[name]] for name in names],
+    )
+    cycles = [
+        sorted(names[member] for member in members)
+        for members in components
+        if len(members) > 1 or names[members[0]] in depends[names[members[0]]]
+    ]
+    if cycles:
+        raise DependencyCycle(sorted(cycles))
+    # Without cycles, each component has one addon, and the components come after
+    # their dependencies.
+    level: Dict[str, int] = {}
+    levels: List[List[str]] = []
+    dependents: Dict[str, List[str]] = {name: [] for name in names}
+    for (member,) in components:
+        name = names[member]
+        level[name] = max((level[d] + 1 for d in depends[name]), default=0)
+        if level[name] == len(levels):
+            levels.append([])
+        levels[level[name]].append(name)
+        for dependency in depends[name]:
+            dependents[dependency].append(name)
+    for names_of_level in levels:
+        names_of_level.sort()
+    return _Order(depends, dependents, levels)
+
+
+def topological_levels(addons_set: AddonsSet) -> List[List[str]]:
+    """Return the names of the addons of an addons set, by dependency level.
+
+    The first level has the addons that have no dependencies in the addons set,
+    and each following level has the addons whose dependencies are all in the
+    previous levels. Dependencies that are not in the addons set are ignored.
+    Addons are sorted by name in each level.
+
+    Raise :class:`~manifestoo_core.exceptions.DependencyCycle` if addons depend on
+    each other.
+    """
+    return _order(addons_set).levels
+
+
+class ScheduleResult(NamedTuple):
+    """The outcome of :func:`run_in_dependency_order`."""
+
+    results: Dict[str, Any]
+    """The return value of the function, for each addon for which it succeeded."""
+    errors: Dict[str, BaseException]
+    """The exception raised by the function, for each addon for which it failed."""
+    skipped: Dict[str, str]
+    """The addons that were not run, with the failed addon they depend on."""
+
+
+def run_in_dependency_order(
+    addons_set: AddonsSet,
+    func: Callable[[Addon], Any],
+    executor: Optional[Executor] = None,
+    workers: Optional[int] = None,
+) -> ScheduleResult:
+    """Call a function on each addon of an addons set, after its dependencies.
+
+    ``func`` is called with each :class:`~manifestoo_core.addon.Addon` in
+    ``executor``, as soon as it has succeeded for all the dependencies of the
+    addon that are in the addons set, so addons of different dependency levels
+    may run at the same time. Among the addons that become ready together, those
+    with the longest chain of dependents are submitted first.
+
+    If ``func`` raises an exception for an addon, it is not called for the addons
+    that depend on it, directly or indirectly, which are reported as skipped.
+
+    ``executor`` may be a process pool, in which case ``func`` and the addons must
+    be picklable. Without executor, a thread pool of ``workers`` threads is used.
+
+    Raise :class:`~manifestoo_core.exceptions.DependencyCycle` before calling
+    ``func`` if addons depend on each other.
+    """
+    order = _order(addons_set)
+    run_executor = executor or ThreadPoolExecutor(max_workers=workers)
+    try:
+        return _Run(addons_set, func, run_executor, order).run()
+    finally:
+        if executor is None:
+            run_executor.shutdown()
+
+
+class _Run:
+    def __init__(
+        self,
+        addons_set: AddonsSet,
+        func: Callable[[Addon], Any],
+        executor: Executor,
+        order: _Order,
+    ) -> None:
+        self.addons_set = addons_set
+        self.func = func
+        self.executor = executor
+        self.order = order
+        # the length of the longest chain of dependents of each addon
+        self.height: Dict[str, int] = {}
+        for names in reversed(order.levels):
+            for name in names:
+                self.height[name] = max(
+                    (self.height[d] + 1 for d in order.dependents[name]), default=0
+                )
+        self.remaining = {name: len(d) for name, d in order.depends.items()}
+        self.pending: Dict[Future[Any], str] = {}
+        self.result = ScheduleResult(results={}, errors={}, skipped={})
+
+    def run(self) -> ScheduleResult:
+        self.submit(name for name, count in self.remaining.items() if count == 0)
+        while self.pending:
+            done, _ = wait(self.pending, return_when=FIRST_COMPLETED)
+            ready: List[str] = []
+            for future in done:
+                ready.extend(self.complete(future))
+            self.submit(ready)
+        return self.result
+
+    def submit(self, names: Iterable[str]) -> None:
+        for name in sorted(names, key=lambda name: (-self.height[name], name)):
+            future = self.executor.submit(self.func, self.addons_set[name])
+            self.pending[future] = name
+
+    def complete(self, future: "Future[Any]") -> List[str]:
+        """Record the outcome of an addon, and return the addons now ready."""
+        name = self.pending.pop(future)
+        error = future.exception()
+        if error is not None:
+            self.result.errors[name] = error
+            self.skip(name)
+            return []
+        self.result.results[name] = future.result()
+        ready = []
+        for dependent in self.order.dependents[name]:
+            self.remaining[dependent] -= 1
+            if self.remaining[dependent] == 0:
+                ready.append(dependent)
+        return ready
+
+    def skip(self, failed: str) -> None:
+        """Skip the addons that depend on a failed addon."""
+        stack = list(self.order.dependents[failed])
+        while stack:
+            name = stack.pop()
+            if name not in self.result.skipped:
+                self.result.skipped[name] = failed
+                stack.extend(self.order.dependents[name])
@@ -1,8 +1,16 @@
+import pickle
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
-from manifestoo_core.addon import Addon, is_addon_dir
+from manifestoo_core.addon import (
+    Addon,
+    AddonDirStatus,
+    is_addon_dir,
+    probe_addon_dir,
+    probe_addon_dirs,
+)
 from manifestoo_core.exceptions import (
     AddonNotFoundInvalidManifest,
     AddonNotFoundNoInit,
@@ -10,7 +18,7 @@ from manifestoo_core.exceptions import (
     AddonNotFoundNotADirectory,
     AddonNotFoundNotInstallable,
 )
-from manifestoo_core.manifest import Manifest
+from manifestoo_core.manifest import InvalidManifest, Manifest
 
 
 @pytest.fixture(
@@ -124,6 +132,40 @@ def test_no_init(addon_dir: Path) -> None:
         Addon.from_addon_dir(addon_dir)
 
 
+def test_file(tmp_path: Path) -> None:
+    (tmp_path / "a").touch()
+    with pytest.raises(AddonNotFoundNotADirectory):
+        Addon.from_addon_dir(tmp_path / "a")
+
+
+def test_manifest_is_a_directory(addon_dir: Path) -> None:
+    (addon_dir / "__manifest__.py").unlink()
+    (addon_dir / "__manifest__.py").mkdir()
+    with pytest.raises(AddonNotFoundNoManifest):
+        Addon.from_addon_dir(addon_dir)
+
+
+def test_manifest_precedence(addon_dir: Path) -> None:
+    (addon_dir / "__openerp__.py").write_text("{'name': 'openerp'}")
+    assert Addon.from_addon_dir(addon_dir).manifest_path.name == "__manifest__.py"
+    (addon_dir / "__manifest__.py").unlink()
+    assert Addon.from_addon_dir(addon_dir).manifest.name == "openerp"
+
+
+def test_symlinks(addon_dir: Path, tmp_path: Path) -> None:
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    (addon_dir / "__manifest__.py").rename(real_dir / "__manifest__.py")
+    (addon_dir / "__init__.py").rename(real_dir / "__init__.py")
+    (addon_dir / "__manifest__.py").symlink_to(real_dir / "__manifest__.py")
+    (addon_dir / "__init__.py").symlink_to(real_dir / "__init__.py")
+    link_dir = tmp_path / "link"
+    link_dir.symlink_to(addon_dir)
+    addon = Addon.from_addon_dir(link_dir)
+    assert addon.name == "link"
+    assert addon.manifest_path == link_dir / "__manifest__.py"
+
+
 def test_addon_constructor() -> None:
     manifest = Manifest.from_dict({"name": "the addon"})
     addon = Addon(
@@ -137,6 +179,9 @@ def test_addon_constructor() -> None:
         name="theaddon",
     )
     assert addon.name == "theaddon"
+    other_manifest = Manifest.from_dict({"name": "other"})
+    addon.manifest = other_manifest
+    assert addon.manifest is other_manifest
 
 
 @pytest.mark.parametrize(
@@ -161,3 +206,124 @@ def test_addon_constructor() -> None:
 )
 def test_is_addon_dir_ok(addon_dir: Path, expected: bool) -> None:
     assert is_addon_dir(addon_dir) is expected
+
+
+@pytest.mark.parametrize(
+    ("manifest", "allow_not_installable", "expected"),
+    [
+        ("{}", False, AddonDirStatus.OK),
+        ("{'installable': False}", False, AddonDirStatus.NOT_INSTALLABLE),
+        ("{'installable': False}", True, AddonDirStatus.OK),
+        ("{'installable': '?'}", False, AddonDirStatus.INVALID_MANIFEST),
+        ("{'installable':", False, AddonDirStatus.INVALID_MANIFEST),
+        ("[]", False, AddonDirStatus.INVALID_MANIFEST),
+        # the manifest is not parsed when installability is not checked
+        ("{'installable':", True, AddonDirStatus.OK),
+    ],
+)
+def test_probe_addon_dir(
+    addon_dir: Path,
+    manifest: str,
+    allow_not_installable: bool,
+    expected: AddonDirStatus,
+) -> None:
+    (addon_dir / "__manifest__.py").write_text(manifest)
+    assert probe_addon_dir(addon_dir, allow_not_installable) is expected
+
+
+@pytest.mark.parametrize("allow_not_installable", [False, True])
+@pytest.mark.parametrize("manifest", ["{'name':", "{1: 'a'}"])
+def test_is_addon_dir_invalid_manifest(
+    addon_dir: Path,
+    manifest: str,
+    allow_not_installable: bool,
+) -> None:
+    (addon_dir / "__manifest__.py").write_text(manifest)
+    assert not is_addon_dir(addon_dir, allow_not_installable)
+
+
+def test_probe_addon_dirs(tmp_path: Path) -> None:
+    for name in ("ok", "no_init", "invalid"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "__manifest__.py").write_text("{}")
+    (tmp_path / "ok" / "__init__.py").touch()
+    (tmp_path / "invalid" / "__manifest__.py").write_text("{")
+    (tmp_path / "setup").mkdir()
+    (tmp_path / "file").touch()
+    expected = {
+        tmp_path / "ok": AddonDirStatus.OK,
+        tmp_path / "no_init": AddonDirStatus.NO_INIT,
+        tmp_path / "invalid": AddonDirStatus.INVALID_MANIFEST,
+        tmp_path / "setup": AddonDirStatus.NO_MANIFEST,
+        tmp_path / "file": AddonDirStatus.NOT_A_DIRECTORY,
+        tmp_path / "missing": AddonDirStatus.NOT_A_DIRECTORY,
+    }
+    for workers in (None, 3):
+        statuses = probe_addon_dirs(expected, workers=workers)
+        assert list(statuses.items()) == list(expected.items())
+
+
+def test_slots(addon_dir: Path) -> None:
+    addon = Addon.from_addon_dir(addon_dir)
+    assert not hasattr(addon, "__dict__")
+    unpickled_addon = pickle.loads(pickle.dumps(addon))  # noqa: S301
+    assert unpickled_addon.manifest_path == addon.manifest_path
+    assert unpickled_addon.manifest.manifest_dict == {}
+
+
+@pytest.mark.parametrize(
+    "addon_dir",
+    [
+        {
+            "dir": "a",
+            "manifest": "{'name': 'A', 'version': '1.0'}",
+        },
+    ],
+    indirect=True,
+)
+def test_lazy(addon_dir: Path) -> None:
+    with mock.patch.object(Manifest, "from_file", wraps=Manifest.from_file) as m:
+        addon = Addon.from_addon_dir(
+            addon_dir, allow_not_installable=True, manifest_keys=["name"], lazy=True
+        )
+        assert addon.name == "a"
+        m.assert_not_called()
+        assert addon.manifest.manifest_dict == {"name": "A"}
+        assert addon.manifest is addon.manifest
+        m.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "addon_dir",
+    [
+        {
+            "dir": "a",
+            "manifest": "{'installable': False, 'name': }",
+        },
+    ],
+    indirect=True,
+)
+def test_lazy_invalid_manifest(addon_dir: Path) -> None:
+    with pytest.raises(AddonNotFoundInvalidManifest):
+        Addon.from_addon_dir(addon_dir, lazy=True)
+    addon = Addon.from_addon_dir(addon_dir, allow_not_installable=True, lazy=True)
+    with pytest.raises(InvalidManifest):
+        addon.manifest  # noqa: B018
+
+
+@pytest.mark.parametrize(
+    "addon_dir",
+    [
+        {
+            "dir": "a",
+            "manifest": "{'installable': False, 'name': 'A'}",
+        },
+    ],
+    indirect=True,
+)
+def test_lazy_not_installable(addon_dir: Path) -> None:
+    with pytest.raises(AddonNotFoundNotInstallable):
+        Addon.from_addon_dir(addon_dir, lazy=True)
+    (addon_dir / "__init__.py").unlink()
+    with pytest.raises(AddonNotFoundNoInit):
+        Addon.from_addon_dir(addon_dir, allow_not_installable=True, lazy=True)
@@ -0,0 +1,116 @@
+from pathlib import Path
+from typing import Any, Iterator
+from unittest import mock
+
+import pytest
+
+from manifestoo_core.addon import (
+    Addon,
+    AddonCache,
+    CacheInfo,
+    get_addon_cache,
+    is_addon_dir,
+    set_addon_cache,
+)
+from manifestoo_core.addons_set import AddonsSet
+from manifestoo_core.exceptions import (
+    AddonNotFoundInvalidManifest,
+    AddonNotFoundNoInit,
+    AddonNotFoundNotADirectory,
+    AddonNotFoundNotInstallable,
+)
+from manifestoo_core.manifest import Manifest
+
+
+@pytest.fixture
+def cache() -> Iterator[AddonCache]:
+    cache = AddonCache(maxsize=2)
+    set_addon_cache(cache)
+    try:
+        yield cache
+    finally:
+        set_addon_cache(None)
+
+
+def _make_addon(addon_dir: Path, manifest: str = "{}") -> None:
+    addon_dir.mkdir()
+    addon_dir.joinpath("__init__.py").touch()
+    addon_dir.joinpath("__manifest__.py").write_text(manifest)
+
+
+def test_identity(tmp_path: Path, cache: AddonCache) -> None:
+    assert get_addon_cache() is cache
+    _make_addon(tmp_path / "a")
+    addon = Addon.from_addon_dir(tmp_path / "a")
+    assert Addon.from_addon_dir(tmp_path / "a") is addon
+    assert cache.cache_info() == CacheInfo(hits=1, misses=1, maxsize=2, currsize=1)
+
+
+def test_manifest_changed(tmp_path: Path, cache: AddonCache) -> None:
+    _make_addon(tmp_path / "a", "{'name': 'A'}")
+    addon = Addon.from_addon_dir(tmp_path / "a")
+    (tmp_path / "a" / "__manifest__.py").write_text("{'name': 'AA'}")
+    other_addon = Addon.from_addon_dir(tmp_path / "a")
+    assert other_addon is not addon
+    assert other_addon.manifest.name == "AA"
+
+
+def test_manifest_changed_while_loading(tmp_path: Path, cache: AddonCache) -> None:
+    _make_addon(tmp_path / "a", "{'name': 'A'}")
+    from_file = Manifest.from_file
+
+    def from_file_and_edit(manifest_path: Path, *args: Any, **kwargs: Any) -> Any:
+        manifest = from_file(manifest_path, *args, **kwargs)
+        manifest_path.write_text("{'name': 'AA'}")
+        return manifest
+
+    with mock.patch.object(Manifest, "from_file", side_effect=from_file_and_edit):
+        assert Addon.from_addon_dir(tmp_path / "a").manifest.name == "A"
+    assert Addon.from_addon_dir(tmp_path / "a").manifest.name == "AA"
+
+
+def test_init_removed(tmp_path: Path, cache: AddonCache) -> None:
+    _make_addon(tmp_path / "a")
+    assert Addon.from_addon_dir(tmp_path / "a")
+    (tmp_path / "a" / "__init__.py").unlink()
+    with pytest.raises(AddonNotFoundNoInit):
+        Addon.from_addon_dir(tmp_path / "a")
+    with pytest.raises(AddonNotFoundNoInit):
+        Addon.from_addon_dir(tmp_path / "a")
+    assert cache.cache_info().hits == 1
+
+
+def test_not_installable(tmp_path: Path, cache: AddonCache) -> None:
+    _make_addon(tmp_path / "a", "{'installable': False}")
+    with pytest.raises(AddonNotFoundNotInstallable):
+        Addon.from_addon_dir(tmp_path / "a")
+    assert Addon.from_addon_dir(tmp_path / "a", allow_not_installable=True)
+    assert cache.cache_info().hits == 1
+
+
+def test_invalid_installable(tmp_path: Path, cache: AddonCache) -> None:
+    _make_addon(tmp_path / "a", "{'installable': 'yes'}")
+    _make_addon(tmp_path / "b")
+    with pytest.raises(AddonNotFoundInvalidManifest):
+        Addon.from_addon_dir(tmp_path / "a")
+    with pytest.raises(AddonNotFoundInvalidManifest):
+        Addon.from_addon_dir(tmp_path / "a")
+    assert not is_addon_dir(tmp_path / "a")
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path)
+    assert str(addons_set) == "b"
+
+
+def test_not_a_directory(tmp_path: Path, cache: AddonCache) -> None:
+    with pytest.raises(AddonNotFoundNotADirectory):
+        Addon.from_addon_dir(tmp_path / "a")
+    assert cache.cache_info().currsize == 0
+
+
+def test_maxsize(tmp_path: Path, cache: AddonCache) -> None:
+    for name in ("a", "b", "c"):
+        _make_addon(tmp_path / name)
+        Addon.from_addon_dir(tmp_path / name)
+    assert cache.cache_info().currsize == 2  # noqa: PLR2004
+    cache.clear()
+    assert cache.cache_info() == CacheInfo(hits=0, misses=0, maxsize=2, currsize=0)
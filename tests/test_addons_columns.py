@@ -0,0 +1,66 @@
+import pytest
+
+from manifestoo_core.addons_columns import AddonsColumns
+
+from .common import mock_addons_set
+
+
+@pytest.fixture
+def columns() -> AddonsColumns:
+    return AddonsColumns(
+        mock_addons_set(
+            {
+                "b": {
+                    "version": "17.0.1.0.0",
+                    "license": "AGPL-3",
+                    "author": "ACSONE SA/NV, Odoo Community Association (OCA)",
+                    "depends": ["base", "mail"],
+                    "development_status": "Beta",
+                },
+                "a": {
+                    "version": "17.0.1.2.0",
+                    "license": "LGPL-3",
+                    "author": "Odoo Community Association (OCA)",
+                    "category": "Tools",
+                },
+                "c": {"version": "1.0", "license": "AGPL-3"},
+            }
+        )
+    )
+
+
+def test_columns(columns: AddonsColumns) -> None:
+    assert len(columns) == 3  # noqa: PLR2004
+    assert columns.names == ["a", "b", "c"]
+    assert columns.versions == ["17.0.1.2.0", "17.0.1.0.0", "1.0"]
+    assert columns.series == ["17.0", "17.0", None]
+    assert columns.licenses == ["LGPL-3", "AGPL-3", "AGPL-3"]
+    assert columns.licenses[1] is columns.licenses[2]
+    assert columns.authors == [
+        ("Odoo Community Association (OCA)",),
+        ("ACSONE SA/NV", "Odoo Community Association (OCA)"),
+        (),
+    ]
+    assert columns.authors[0][0] is columns.authors[1][1]
+    assert columns.categories == ["Tools", None, None]
+    assert columns.development_statuses == [None, "Beta", None]
+    assert list(columns.depends_counts) == [0, 2, 0]
+
+
+def test_rows(columns: AddonsColumns) -> None:
+    assert columns.rows(licenses="AGPL-3", series="17.0") == [1]
+    assert columns.rows(authors="Odoo Community Association (OCA)") == [0, 1]
+    assert columns.rows(series=None) == [2]
+    assert columns.rows() == [0, 1, 2]
+    with pytest.raises(TypeError):
+        columns.rows(unknown=1)
+
+
+def test_to_numpy(columns: AddonsColumns) -> None:
+    numpy = pytest.importorskip("numpy")
+    array = columns.to_numpy()
+    selected = array[(array["license"] == "AGPL-3") & (array["series"] == "17.0")]
+    assert list(selected["name"]) == ["b"]
+    assert list(array["depends_count"]) == [0, 2, 0]
+    assert array["depends_count"].dtype == numpy.int32
+    assert list(array["series"]) == ["17.0", "17.0", ""]
@@ -0,0 +1,99 @@
+import pytest
+
+from manifestoo_core.addons_index import AddonsIndex
+from manifestoo_core.addons_set import AddonsSet
+from manifestoo_core.exceptions import InvalidManifest
+
+from .common import mock_addons_set
+
+OCA = "Odoo Community Association (OCA)"
+
+
+@pytest.fixture
+def addons_set() -> AddonsSet:
+    return mock_addons_set(
+        {
+            "a": {
+                "author": f"ACSONE SA/NV, {OCA}",
+                "license": "AGPL-3",
+                "category": "Tools",
+                "development_status": "Beta",
+                "external_dependencies": {"python": ["requests"]},
+            },
+            "b": {"author": OCA, "license": "LGPL-3", "category": "Tools"},
+            "c": {"author": "Someone", "license": "AGPL-3"},
+            "d": {},
+        }
+    )
+
+
+def test_get(addons_set: AddonsSet) -> None:
+    index = AddonsIndex(addons_set)
+    assert index.get("authors", OCA) == {"a", "b"}
+    assert index.get("authors", "ACSONE SA/NV") == {"a"}
+    assert index.get("license", "AGPL-3") == {"a", "c"}
+    assert index.get("license", "OPL-1") == set()
+    assert index.get("development_status", "Beta") == {"a"}
+    assert index.get("python", "requests") == {"a"}
+    assert index.facets("category") == {"Tools": 2}
+    with pytest.raises(KeyError):
+        index.get("website", "https://example.com")
+
+
+def test_select(addons_set: AddonsSet) -> None:
+    index = AddonsIndex(addons_set)
+    assert index.select(authors=OCA, license="AGPL-3") == {"a"}
+    assert index.select(license=["AGPL-3", "LGPL-3"]) == {"a", "b", "c"}
+    assert index.select(license=["AGPL-3", "LGPL-3"], category="Tools") == {"a", "b"}
+    assert index.select(license="OPL-1", category="Tools") == set()
+    assert index.select() == {"a", "b", "c", "d"}
+    assert index.select(license="AGPL-3") - index.select(authors=OCA) == {"c"}
+
+
+def test_fields(addons_set: AddonsSet) -> None:
+    index = AddonsIndex(addons_set, fields=["license"])
+    assert index.get("license", "LGPL-3") == {"b"}
+    with pytest.raises(KeyError):
+        index.get("authors", OCA)
+    with pytest.raises(ValueError, match="website"):
+        AddonsIndex(addons_set, fields=["license", "website"])
+
+
+def test_follow_addons_set(addons_set: AddonsSet) -> None:
+    index = AddonsIndex(addons_set)
+    version = index.version
+    addons_set["e"] = mock_addons_set({"e": {"author": OCA}})["e"]
+    addons_set["b"] = mock_addons_set({"b": {"author": "Someone"}})["b"]
+    del addons_set["a"]
+    assert index.version > version
+    assert index.get("authors", OCA) == {"e"}
+    assert index.get("authors", "Someone") == {"b", "c"}
+    assert index.facets("license") == {"AGPL-3": 1}
+    assert index.facets("python") == {}
+    assert index.facets("authors") == {OCA: 1, "Someone": 2}
+
+
+def test_invalid_manifest(addons_set: AddonsSet) -> None:
+    index = AddonsIndex(addons_set)
+    del addons_set["a"]
+    addons_set["x"] = mock_addons_set({"x": {"author": 1}})["x"]
+    for _ in range(2):
+        with pytest.raises(InvalidManifest):
+            index.get("authors", OCA)
+    addons_set["x"] = mock_addons_set({"x": {"author": OCA}})["x"]
+    assert index.get("authors", OCA) == {"b", "x"}
+    assert index.facets("python") == {}
+    assert index.select() == {"b", "c", "d", "x"}
+
+
+def test_python_invalid() -> None:
+    addons_set = mock_addons_set(
+        {
+            "a": {"external_dependencies": {"python": "requests"}},
+            "b": {"external_dependencies": {"python": {"lxml": "4.0"}}},
+            "c": {"external_dependencies": {"python": ["lxml", 1, ["x"]]}},
+        }
+    )
+    index = AddonsIndex(addons_set)
+    assert index.facets("python") == {"lxml": 1}
+    assert index.get("python", "lxml") == {"c"}
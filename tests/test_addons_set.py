@@ -1,9 +1,30 @@
+import asyncio
+import marshal
+import pickle
+import shutil
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, Optional
+from unittest import mock
 
-from manifestoo_core.addons_set import AddonsSet
+import pytest
 
-from .common import populate_addons_dir
+from manifestoo_core.addon import Addon, AddonCache, set_addon_cache
+from manifestoo_core.addons_set import (
+    AddonsSet,
+    AddonsSetChanges,
+    aiter_addons,
+    iter_addon_dirs,
+    iter_addons,
+)
+from manifestoo_core.exceptions import (
+    AddonNotFoundNoManifest,
+    AddonNotFoundNotInstallable,
+    InvalidManifest,
+)
+from manifestoo_core.manifest import CompactManifest, Manifest
+
+from .common import mock_addons_set, populate_addons_dir
 
 
 def test_from_addons_dir(tmp_path: Path) -> None:
@@ -39,3 +60,511 @@ def test_from_missing_dir(tmp_path: Path) -> None:
     addons_set = AddonsSet()
     addons_set.add_from_addons_dirs([tmp_path / "not-a-dir"])
     assert str(addons_set) == ""
+
+
+def test_from_addons_dir_manifest_keys(tmp_path: Path) -> None:
+    addons: Dict[str, Dict[str, Any]] = {
+        "a": {"version": "16.0.1.0.0", "name": "A"},
+        "b": {"installable": False},
+    }
+    populate_addons_dir(tmp_path, addons)
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path, manifest_keys=["version"])
+    assert str(addons_set) == "a"
+    assert addons_set["a"].manifest.manifest_dict == {"version": "16.0.1.0.0"}
+
+
+def test_from_addons_dir_entries(tmp_path: Path) -> None:
+    addons: Dict[str, Dict[str, Any]] = {
+        "a": {},
+    }
+    populate_addons_dir(tmp_path, addons)
+    (tmp_path / "b").touch()
+    (tmp_path / "c").mkdir()
+    (tmp_path / "d").symlink_to(tmp_path / "a")
+    (tmp_path / "e").symlink_to(tmp_path / "missing")
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path)
+    assert str(addons_set) == "a,d"
+    assert addons_set["d"].path == tmp_path / "d"
+
+
+def test_from_file(tmp_path: Path) -> None:
+    (tmp_path / "a").touch()
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path / "a")
+    assert str(addons_set) == ""
+
+
+@pytest.mark.parametrize("workers", [None, 1, 4])
+def test_from_addons_dirs_workers(tmp_path: Path, workers: Optional[int]) -> None:
+    addons_dirs = []
+    for i in range(5):
+        addons: Dict[str, Dict[str, Any]] = {
+            f"a{j}": {"name": f"a{j} in {i}"} for j in range(i, i + 10)
+        }
+        addons_dir = tmp_path / f"addons_dir_{i}"
+        populate_addons_dir(addons_dir, addons)
+        addons_dirs.append(addons_dir)
+    addons_dirs.append(tmp_path / "not-a-dir")
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(addons_dirs, workers=workers)
+    assert len(addons_set) == 14  # noqa: PLR2004
+    assert addons_set["a0"].manifest.name == "a0 in 0"
+    assert addons_set["a5"].manifest.name == "a5 in 4"
+    assert addons_set["a13"].manifest.name == "a13 in 4"
+
+
+def test_from_addons_dir_workers(tmp_path: Path) -> None:
+    addons: Dict[str, Dict[str, Any]] = {
+        "a": {},
+        "b": {"installable": False},
+    }
+    populate_addons_dir(tmp_path, addons)
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path, workers=2)
+    assert str(addons_set) == "a"
+
+
+def _aiter_addons_list(addons_dirs: List[Path], **kwargs: Any) -> List[Addon]:
+    async def collect() -> List[Addon]:
+        return [addon async for addon in aiter_addons(addons_dirs, **kwargs)]
+
+    return asyncio.run(collect())
+
+
+@pytest.mark.parametrize("concurrency", [1, 3, 100])
+def test_aiter_addons(tmp_path: Path, concurrency: int) -> None:
+    addons_dirs = []
+    for i in range(3):
+        addons: Dict[str, Dict[str, Any]] = {
+            f"a{j}": {"name": f"a{j} in {i}"} for j in range(i, i + 5)
+        }
+        addons["x"] = {"installable": False}
+        addons_dir = tmp_path / f"addons_dir_{i}"
+        populate_addons_dir(addons_dir, addons)
+        addons_dirs.append(addons_dir)
+    addons_dirs.append(tmp_path / "not-a-dir")
+    addons_list = _aiter_addons_list(addons_dirs, concurrency=concurrency)
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(addons_dirs)
+    assert [addon.path for addon in addons_list] == [
+        addon_dir
+        for addons_dir in addons_dirs[:-1]
+        for addon_dir in addons_dir.iterdir()
+        if addon_dir.name != "x"
+    ]
+    assert {addon.name: addon.path for addon in addons_list} == {
+        name: addon.path for name, addon in addons_set.items()
+    }
+
+
+def test_aiter_addons_manifest_keys(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {"name": "A", "version": "1.0"}})
+    (addon,) = _aiter_addons_list([tmp_path], manifest_keys=["name"])
+    assert addon.manifest.manifest_dict == {"name": "A"}
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_aiter_addons_invalid_concurrency(tmp_path: Path, concurrency: int) -> None:
+    populate_addons_dir(tmp_path, {"a": {}})
+    with pytest.raises(ValueError, match="concurrency"):
+        _aiter_addons_list([tmp_path], concurrency=concurrency)
+
+
+def test_aiter_addons_cancel(tmp_path: Path) -> None:
+    addons: Dict[str, Dict[str, Any]] = {f"a{i}": {} for i in range(20)}
+    populate_addons_dir(tmp_path, addons)
+    started = threading.Semaphore(0)
+    release = threading.Event()
+    from_addon_dir = Addon.from_addon_dir
+
+    def slow_from_addon_dir(addon_dir: Path, **kwargs: Any) -> Addon:
+        started.release()
+        release.wait()
+        return from_addon_dir(addon_dir, **kwargs)
+
+    async def consume() -> List[Addon]:
+        return [addon async for addon in aiter_addons([tmp_path], concurrency=2)]
+
+    async def run() -> None:
+        task = asyncio.ensure_future(consume())
+        await asyncio.get_running_loop().run_in_executor(None, started.acquire)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        release.set()
+
+    with mock.patch(
+        "manifestoo_core.addons_set.Addon.from_addon_dir",
+        side_effect=slow_from_addon_dir,
+    ) as mock_from_addon_dir:
+        asyncio.run(run())
+    # the pending loads were cancelled before they started
+    assert mock_from_addon_dir.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("track_changes", [False, True])
+def test_refresh(tmp_path: Path, track_changes: bool) -> None:
+    addons: Dict[str, Dict[str, Any]] = {
+        "a": {"name": "A"},
+        "b": {"name": "B"},
+        "c": {"name": "C"},
+        "d": {"installable": False},
+        "e": {"name": "E"},
+    }
+    populate_addons_dir(tmp_path / "dir1", addons)
+    populate_addons_dir(tmp_path / "dir2", {"e": {"name": "E2"}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(
+        [tmp_path / "dir1", tmp_path / "dir2"], track_changes=track_changes
+    )
+    assert str(addons_set) == "a,b,c,e"
+    a = addons_set["a"]
+    changes = addons_set.refresh()
+    assert changes == AddonsSetChanges(added=set(), removed=set(), modified=set())
+    assert addons_set["a"] is a
+    # modify b, remove c, make d installable, add f, remove e from dir2
+    manifest_path = tmp_path / "dir1" / "b" / "__manifest__.py"
+    manifest_path.write_text("{'name': 'B2', 'description': 'changed'}")
+    shutil.rmtree(tmp_path / "dir1" / "c")
+    (tmp_path / "dir1" / "d" / "__manifest__.py").write_text("{'version': '2.0'}")
+    populate_addons_dir(tmp_path / "dir1", {"f": {}})
+    shutil.rmtree(tmp_path / "dir2" / "e")
+    changes = addons_set.refresh()
+    assert changes == AddonsSetChanges(
+        added={"d", "f"},
+        removed={"c"},
+        modified={"b", "e"},
+    )
+    assert str(addons_set) == "a,b,d,e,f"
+    assert addons_set["a"] is a
+    assert addons_set["b"].manifest.name == "B2"
+    assert addons_set["e"].manifest.name == "E"
+
+
+def test_refresh_manifest_changed_while_loading(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {"version": "16.0"}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path, track_changes=True)
+    manifest_path = tmp_path / "a" / "__manifest__.py"
+    manifest_path.write_text("{'version': '16.0.1'}")
+    from_file = Manifest.from_file
+
+    def from_file_and_edit(path: Path, *args: Any, **kwargs: Any) -> Any:
+        manifest = from_file(path, *args, **kwargs)
+        manifest_path.write_text("{'version': '17.0'}")
+        return manifest
+
+    with mock.patch.object(Manifest, "from_file", side_effect=from_file_and_edit):
+        assert addons_set.refresh().modified == {"a"}
+    assert addons_set["a"].manifest.version == "16.0.1"
+    assert addons_set.refresh().modified == {"a"}
+    assert addons_set["a"].manifest.version == "17.0"
+
+
+def test_refresh_init_removed(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path)
+    (tmp_path / "a" / "__init__.py").unlink()
+    assert addons_set.refresh().removed == {"a"}
+    (tmp_path / "a" / "__init__.py").touch()
+    assert addons_set.refresh().added == {"a"}
+
+
+def test_refresh_keeps_other_addons(tmp_path: Path) -> None:
+    addons_set = mock_addons_set({"a": {}})
+    assert addons_set.refresh() == AddonsSetChanges(
+        added=set(), removed=set(), modified=set()
+    )
+    assert str(addons_set) == "a"
+    populate_addons_dir(tmp_path / "dir", {"b": {}, "c": {}})
+    populate_addons_dir(tmp_path / "other", {"d": {}})
+    addons_set.add_from_addons_dir(tmp_path / "dir")
+    addons_set["d"] = Addon.from_addon_dir(tmp_path / "other" / "d")
+    shutil.rmtree(tmp_path / "dir" / "c")
+    assert addons_set.refresh().removed == {"c"}
+    assert str(addons_set) == "a,b,d"
+
+
+def test_untracked_no_stat(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {}, "b": {"name": "B"}})
+    addons_set = AddonsSet()
+    with mock.patch(
+        "manifestoo_core.addons_set.stat_signature"
+    ) as stat_signature, mock.patch(
+        "manifestoo_core.addons_set._addon_signature"
+    ) as addon_signature:
+        addons_set.add_from_addons_dir(tmp_path)
+        a = addons_set["a"]
+        (tmp_path / "b" / "__manifest__.py").write_text("{'name': 'B2'}")
+        assert addons_set.refresh().modified == {"b"}
+    stat_signature.assert_not_called()
+    addon_signature.assert_not_called()
+    assert addons_set["a"] is a
+    assert addons_set["b"].manifest.name == "B2"
+
+
+@pytest.mark.parametrize("workers", [None, 4])
+def test_refresh_no_reload(tmp_path: Path, workers: Optional[int]) -> None:
+    populate_addons_dir(tmp_path, {f"a{i}": {} for i in range(10)})
+    (tmp_path / "not-an-addon").mkdir()
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path, manifest_keys=["name"], track_changes=True)
+    with mock.patch(
+        "manifestoo_core.addons_set.Addon.from_addon_dir"
+    ) as from_addon_dir, mock.patch("manifestoo_core.addons_set.os.scandir") as scandir:
+        assert not any(addons_set.refresh(workers))
+    from_addon_dir.assert_not_called()
+    scandir.assert_not_called()
+    assert len(addons_set) == 10  # noqa: PLR2004
+
+
+def test_from_addons_dir_lazy(tmp_path: Path) -> None:
+    addons: Dict[str, Dict[str, Any]] = {
+        "a": {"name": "A"},
+        "b": {"installable": False},
+    }
+    populate_addons_dir(tmp_path, addons)
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path, lazy=True)
+    assert str(addons_set) == "a"
+    assert addons_set["a"].manifest.name == "A"
+    (tmp_path / "a" / "__manifest__.py").write_text("{'name': 'A2'}")
+    assert addons_set.refresh().modified == {"a"}
+    assert addons_set["a"].manifest.name == "A2"
+
+
+def test_from_addons_tree(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {"name": "root a"}})
+    populate_addons_dir(tmp_path / "repo1", {"a": {"name": "repo1 a"}, "b": {}})
+    populate_addons_dir(tmp_path / "repo1" / "b" / "sub", {"nested": {}})
+    populate_addons_dir(tmp_path / "repo1" / "setup", {"s": {}})
+    populate_addons_dir(tmp_path / "repo1" / ".git", {"g": {}})
+    populate_addons_dir(tmp_path / "repo1" / "docs", {"d": {}})
+    (tmp_path / "repo2").mkdir()
+    populate_addons_dir(tmp_path / "repo2" / "sub", {"c": {}})
+    populate_addons_dir(tmp_path / "repo2" / "sub" / "deeper", {"too_deep": {}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(tmp_path, ignore=["doc*"])
+    assert str(addons_set) == "a,b,c"
+    assert addons_set["b"].path == tmp_path / "repo1" / "b"
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(tmp_path, max_depth=4)
+    assert str(addons_set) == "a,b,c,d,too_deep"
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(tmp_path, max_depth=1)
+    assert str(addons_set) == "a"
+    assert addons_set["a"].manifest.name == "root a"
+
+
+@pytest.mark.parametrize("track_changes", [False, True])
+def test_from_addons_tree_max_depth_1(tmp_path: Path, track_changes: bool) -> None:
+    populate_addons_dir(tmp_path, {"a": {}, "setup": {}, "skipme": {}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(
+        tmp_path, max_depth=1, ignore=["skip*"], track_changes=track_changes
+    )
+    assert str(addons_set) == "a"
+    populate_addons_dir(tmp_path, {"b": {}, "skipme2": {}})
+    assert addons_set.refresh().added == {"b"}
+    assert str(addons_set) == "a,b"
+
+
+def test_from_addons_tree_refresh(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path / "repo1", {"a": {}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(tmp_path)
+    assert str(addons_set) == "a"
+    populate_addons_dir(tmp_path / "repo1", {"b": {}})
+    assert addons_set.refresh().added == {"b"}
+
+
+def test_from_missing_tree(tmp_path: Path) -> None:
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(tmp_path / "not-a-dir")
+    assert str(addons_set) == ""
+
+
+def test_iter_addon_dirs(tmp_path: Path) -> None:
+    addons: Dict[str, Dict[str, Any]] = {
+        "a": {"name": "A"},
+        "b": {"installable": False},
+    }
+    populate_addons_dir(tmp_path, addons)
+    (tmp_path / "setup").mkdir()
+    results = dict(iter_addon_dirs([tmp_path], manifest_keys=["name"]))
+    assert set(results) == {tmp_path / "a", tmp_path / "b", tmp_path / "setup"}
+    a = results[tmp_path / "a"]
+    assert isinstance(a, Addon)
+    assert a.manifest.manifest_dict == {"name": "A"}
+    assert isinstance(results[tmp_path / "b"], AddonNotFoundNotInstallable)
+    assert isinstance(results[tmp_path / "setup"], AddonNotFoundNoManifest)
+
+
+def test_iter_addons(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path / "dir1", {f"a{i}": {} for i in range(10)})
+    populate_addons_dir(tmp_path / "dir2", {"a0": {"installable": False}, "b": {}})
+    addons_dirs = [tmp_path / "dir1", tmp_path / "dir2"]
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(addons_dirs)
+    assert {addon.name: addon.path for addon in iter_addons(addons_dirs)} == {
+        name: addon.path for name, addon in addons_set.items()
+    }
+
+
+def test_iter_addons_stop(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {f"a{i}": {} for i in range(10)})
+    with mock.patch.object(
+        Addon, "from_addon_dir", wraps=Addon.from_addon_dir
+    ) as from_addon_dir:
+        addon = next(iter_addons([tmp_path], lazy=True))
+    assert addon.path.parent == tmp_path
+    from_addon_dir.assert_called_once()
+
+
+def test_version(tmp_path: Path) -> None:
+    addons_set = mock_addons_set({"a": {}, "b": {}})
+    addon = addons_set["a"]
+    version = addons_set.version
+    mutations: List[Callable[[], object]] = [
+        lambda: addons_set.__setitem__("c", addon),
+        lambda: addons_set.__delitem__("c"),
+        lambda: addons_set.update({"c": addon}),
+        lambda: addons_set.setdefault("d", addon),
+        lambda: addons_set.pop("d"),
+        addons_set.popitem,
+        addons_set.clear,
+    ]
+    for mutation in mutations:
+        mutation()
+        assert addons_set.version > version
+        version = addons_set.version
+    populate_addons_dir(tmp_path, {"e": {}})
+    addons_set.add_from_addons_dir(tmp_path)
+    assert addons_set.version > version
+    version = addons_set.version
+    addons_set.refresh()
+    assert addons_set.version == version
+
+
+def test_snapshot(tmp_path: Path) -> None:
+    addons_dir = tmp_path / "addons"
+    populate_addons_dir(addons_dir, {f"a{i}": {"name": f"A{i}"} for i in range(10)})
+    populate_addons_dir(addons_dir, {"b": {"installable": False}})
+    (addons_dir / "not-an-addon").mkdir()
+    populate_addons_dir(tmp_path / "tree", {})
+    populate_addons_dir(tmp_path / "tree" / "sub", {"c": {"name": "C"}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(
+        addons_dir, manifest_keys=["name", "version"], track_changes=True
+    )
+    addons_set.add_from_addons_tree(tmp_path / "tree", lazy=True, track_changes=True)
+    snapshot = tmp_path / "snapshot"
+    addons_set.save(snapshot)
+    with mock.patch(
+        "manifestoo_core.addons_set.Addon.from_addon_dir"
+    ) as from_addon_dir, mock.patch(
+        "manifestoo_core.manifest.Manifest.from_file"
+    ) as from_file:
+        loaded = AddonsSet.load(snapshot)
+        assert loaded["a0"].manifest.name == "A0"
+    from_addon_dir.assert_not_called()
+    from_file.assert_not_called()
+    assert str(loaded) == str(addons_set)
+    assert loaded["c"].manifest.name == "C"
+    assert loaded._scanned_dirs() == addons_set._scanned_dirs()
+    # the snapshot is revalidated
+    (addons_dir / "a1" / "__manifest__.py").write_text("{'name': 'A1 changed'}")
+    shutil.rmtree(addons_dir / "a2")
+    populate_addons_dir(addons_dir, {"d": {}})
+    loaded = AddonsSet.load(snapshot)
+    assert str(loaded) == "a0,a1,a3,a4,a5,a6,a7,a8,a9,c,d"
+    assert loaded["a1"].manifest.name == "A1 changed"
+    assert loaded.refresh() == AddonsSetChanges(set(), set(), set())
+
+
+def test_snapshot_invalid(tmp_path: Path) -> None:
+    snapshot = tmp_path / "snapshot"
+    snapshot.write_bytes(b"garbage")
+    with pytest.raises(ValueError, match="not a valid addons set snapshot"):
+        AddonsSet.load(snapshot)
+    AddonsSet().save(snapshot)
+    snapshot.write_bytes(snapshot.read_bytes()[:-1])
+    with pytest.raises(ValueError, match="not a valid addons set snapshot"):
+        AddonsSet.load(snapshot)
+    snapshot.write_bytes(marshal.dumps((("other", 1), [])))
+    with pytest.raises(ValueError, match="unsupported format"):
+        AddonsSet.load(snapshot)
+    with pytest.raises(OSError):
+        AddonsSet.load(tmp_path / "missing")
+
+
+def test_compact(tmp_path: Path) -> None:
+    populate_addons_dir(
+        tmp_path,
+        {
+            "a": {"name": "A", "description": "A long description"},
+            "b": {"depends": ["a"], "data": ["views.xml"]},
+            "c": {"version": 1},
+        },
+    )
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path)
+    populate_addons_dir(tmp_path / "lazy", {"d": {}})
+    addons_set.add_from_addons_dir(tmp_path / "lazy", lazy=True)
+    addons = dict(addons_set)
+    version = addons_set.version
+    addons_set.compact()
+    assert addons_set.version > version
+    # compacted addons are new objects, the others are kept
+    assert addons_set["a"] is not addons["a"]
+    assert addons_set["c"] is addons["c"]
+    assert addons_set["d"] is addons["d"]
+    assert addons["a"].manifest.description == "A long description"
+    assert addons_set["a"].path == addons["a"].path
+    assert isinstance(addons_set["a"].manifest, CompactManifest)
+    assert addons_set["a"].manifest.name == "A"
+    assert addons_set["a"].manifest.description is None
+    assert addons_set["b"].manifest.depends == ["a"]
+    assert "data" not in addons_set["b"].manifest.manifest_dict
+    # invalid, and lazy manifests are not compacted
+    assert not isinstance(addons_set["c"].manifest, CompactManifest)
+    with pytest.raises(InvalidManifest):
+        addons_set["c"].manifest.version  # noqa: B018
+    assert not isinstance(addons_set["d"].manifest, CompactManifest)
+    assert not any(addons_set.refresh())
+    assert isinstance(addons_set["a"].manifest, CompactManifest)
+    compacted = dict(addons_set)
+    addons_set.compact()
+    assert addons_set["a"] is compacted["a"]
+    # the manifest of d was loaded since
+    assert isinstance(addons_set["d"].manifest, CompactManifest)
+
+
+def test_compact_addon_cache(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {"name": "A", "description": "A"}})
+    set_addon_cache(AddonCache())
+    try:
+        addons_set = AddonsSet()
+        addons_set.add_from_addons_dir(tmp_path)
+        addons_set.compact()
+        assert addons_set["a"].manifest.description is None
+        addon = Addon.from_addon_dir(tmp_path / "a")
+        assert addon.manifest.manifest_dict == {"name": "A", "description": "A"}
+    finally:
+        set_addon_cache(None)
+
+
+def test_pickle(tmp_path: Path) -> None:
+    populate_addons_dir(tmp_path, {"a": {"name": "A"}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path)
+    addons_set["b"] = mock_addons_set({"b": {}})["b"]
+    unpickled = pickle.loads(pickle.dumps(addons_set))  # noqa: S301
+    assert isinstance(unpickled, AddonsSet)
+    assert str(unpickled) == "a,b"
+    assert unpickled["a"].manifest.name == "A"
+    assert unpickled.version == addons_set.version
+    assert unpickled._scanned_dirs() == addons_set._scanned_dirs()
@@ -0,0 +1,92 @@
+import queue
+import shutil
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from manifestoo_core.addons_set import AddonsSet, AddonsSetChanges
+from manifestoo_core.addons_watcher import AddonsWatcher, inotify_available
+
+from .common import populate_addons_dir
+
+NO_CHANGES = AddonsSetChanges(added=set(), removed=set(), modified=set())
+
+
+@pytest.fixture(
+    params=[
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(
+                not inotify_available(), reason="inotify not available"
+            ),
+        ),
+        False,
+    ],
+    ids=["inotify", "polling"],
+)
+def use_inotify(request: pytest.FixtureRequest) -> bool:
+    return bool(request.param)
+
+
+@pytest.fixture
+def addons_set(tmp_path: Path) -> AddonsSet:
+    populate_addons_dir(tmp_path, {"a": {"name": "A"}, "b": {}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dir(tmp_path)
+    return addons_set
+
+
+@pytest.fixture
+def watcher(addons_set: AddonsSet, use_inotify: bool) -> Iterator[AddonsWatcher]:
+    watcher = AddonsWatcher(
+        addons_set, debounce=0.01, poll_interval=0.01, use_inotify=use_inotify
+    )
+    assert watcher.uses_inotify is use_inotify
+    yield watcher
+    watcher.stop()
+
+
+def test_poll(tmp_path: Path, addons_set: AddonsSet, watcher: AddonsWatcher) -> None:
+    if watcher.uses_inotify:
+        assert watcher.poll(timeout=0.05) == NO_CHANGES
+    (tmp_path / "a" / "__manifest__.py").write_text("{'name': 'A2'}")
+    shutil.rmtree(tmp_path / "b")
+    populate_addons_dir(tmp_path, {"c": {}})
+    assert watcher.poll(timeout=5) == AddonsSetChanges(
+        added={"c"}, removed={"b"}, modified={"a"}
+    )
+    assert addons_set["a"].manifest.name == "A2"
+    # the new addon directory is watched too
+    (tmp_path / "c" / "__init__.py").unlink()
+    assert watcher.poll(timeout=5).removed == {"c"}
+
+
+def test_thread(tmp_path: Path, addons_set: AddonsSet, use_inotify: bool) -> None:
+    events: queue.Queue[AddonsSetChanges] = queue.Queue()
+    with AddonsWatcher(
+        addons_set,
+        callback=events.put,
+        debounce=0.01,
+        poll_interval=0.01,
+        use_inotify=use_inotify,
+    ):
+        populate_addons_dir(tmp_path, {"c": {}})
+        assert events.get(timeout=5) == AddonsSetChanges(
+            added={"c"}, removed=set(), modified=set()
+        )
+    assert "c" in addons_set
+
+
+def test_poll_tree(tmp_path: Path, use_inotify: bool) -> None:
+    populate_addons_dir(tmp_path / "repo1", {"a": {}})
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_tree(tmp_path)
+    watcher = AddonsWatcher(
+        addons_set, debounce=0.01, poll_interval=0.01, use_inotify=use_inotify
+    )
+    try:
+        populate_addons_dir(tmp_path / "repo1", {"b": {}})
+        assert watcher.poll(timeout=5).added == {"b"}
+    finally:
+        watcher.stop()
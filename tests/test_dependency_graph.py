@@ -0,0 +1,179 @@
+import random
+
+import pytest
+
+from manifestoo_core.addon import Addon
+from manifestoo_core.addons_set import AddonsSet
+from manifestoo_core.dependency_graph import DependencyGraph, Reachability
+from manifestoo_core.odoo_series import OdooSeries
+
+from .common import mock_addons_set
+
+
+@pytest.fixture
+def graph() -> DependencyGraph:
+    addons_set = mock_addons_set(
+        {
+            "a": {"depends": ["b", "c"]},
+            "b": {"depends": ["d", "base"]},
+            "c": {"depends": ["d", "missing"]},
+            "d": {},
+            # cycle
+            "x": {"depends": ["y"]},
+            "y": {"depends": ["z", "a"]},
+            "z": {"depends": ["x"]},
+            "self": {"depends": ["self"]},
+        }
+    )
+    return DependencyGraph(addons_set, OdooSeries.v16_0)
+
+
+def test_direct(graph: DependencyGraph) -> None:
+    assert graph.depends("a") == {"b", "c"}
+    assert graph.dependents("d") == {"b", "c"}
+    assert graph.depends("base") == set()
+    assert graph.dependents("base") == {"b"}
+    assert "base" in graph
+    assert "unknown" not in graph
+    assert len(graph) == len(list(graph)) == 10  # noqa: PLR2004
+    with pytest.raises(KeyError):
+        graph.depends("unknown")
+
+
+def test_external(graph: DependencyGraph) -> None:
+    assert graph.core_addons == {"base"}
+    assert graph.missing == {"missing"}
+    assert graph.missing_depends("a") == {"missing"}
+    assert graph.missing_depends("b") == set()
+    assert DependencyGraph(mock_addons_set({"a": {"depends": ["base"]}})).missing == {
+        "base"
+    }
+
+
+def test_all_depends(graph: DependencyGraph) -> None:
+    assert graph.all_depends("a") == {"b", "c", "d", "base", "missing"}
+    assert graph.all_depends("d") == set()
+    assert graph.all_depends("x") == {"x", "y", "z", "a", "b", "c", "d"} | {
+        "base",
+        "missing",
+    }
+    assert graph.all_depends("self") == {"self"}
+    assert graph.all_depends("a") is graph.all_depends("a")
+
+
+def test_all_dependents(graph: DependencyGraph) -> None:
+    assert graph.all_dependents("d") == {"a", "b", "c", "x", "y", "z"}
+    assert graph.all_dependents("x") == {"x", "y", "z"}
+    assert graph.all_dependents("a") == {"x", "y", "z"}
+    assert graph.all_dependents("self") == {"self"}
+
+
+def test_long_chain() -> None:
+    count = 5000
+    addons_set = mock_addons_set(
+        {
+            f"a{i}": {"depends": [f"a{i + 1}"] if i < count - 1 else []}
+            for i in range(count)
+        }
+    )
+    graph = DependencyGraph(addons_set)
+    assert len(graph.all_depends("a0")) == count - 1
+    assert len(graph.all_dependents(f"a{count - 1}")) == count - 1
+    reachability = Reachability(graph)
+    assert reachability.depends_on("a0", f"a{count - 1}")
+    assert bin(reachability.dependents(f"a{count - 1}")).count("1") == count - 1
+
+
+def test_reachability(graph: DependencyGraph) -> None:
+    reachability = Reachability(graph)
+    assert len(reachability) == len(graph)
+    for name in graph:
+        assert set(reachability.names_of(reachability.depends(name))) == (
+            graph.all_depends(name)
+        )
+        assert set(reachability.names_of(reachability.dependents(name))) == (
+            graph.all_dependents(name)
+        )
+    assert reachability.depends_on("a", "d")
+    assert reachability.depends_on("x", "x")
+    assert not reachability.depends_on("a", "a")
+    assert not reachability.depends_on("d", "a")
+    assert reachability.mask([]) == 0
+    assert reachability.names_of(reachability.mask(["b", "a"])) == ["a", "b"]
+
+
+def test_reachability_set_algebra(graph: DependencyGraph) -> None:
+    reachability = Reachability(graph)
+    assert set(reachability.names_of(reachability.common_depends(["b", "c"]))) == {"d"}
+    assert set(reachability.names_of(reachability.union_depends(["b", "c"]))) == {
+        "d",
+        "base",
+        "missing",
+    }
+    assert reachability.common_depends([]) == 0
+    assert reachability.union_depends([]) == 0
+    with pytest.raises(KeyError):
+        reachability.depends("unknown")
+
+
+def test_impacted(graph: DependencyGraph) -> None:
+    assert graph.impacted([]) == set()
+    assert graph.impacted(["d"]) == {"a", "b", "c", "d", "x", "y", "z"}
+    assert graph.impacted(["b", "unknown"]) == {"a", "b", "x", "y", "z"}
+    assert graph.impacted(["z"]) == {"x", "y", "z"}
+    # external dependencies are not addons of the addons set
+    assert graph.impacted(["missing"]) == {"a", "c", "x", "y", "z"}
+    assert graph.impacted(["base"]) == set()
+    assert graph.impacted(["base"], expand_core_addons=True) == {
+        "a",
+        "b",
+        "x",
+        "y",
+        "z",
+    }
+    # memoized closures are reused
+    graph.all_dependents("b")
+    assert graph.impacted(["b", "d"]) == {"a", "b", "c", "d", "x", "y", "z"}
+
+
+def test_incremental() -> None:
+    rng = random.Random(42)  # noqa: S311
+    names = [f"a{i}" for i in range(30)]
+
+    def random_addon(name: str) -> Addon:
+        depends = rng.sample(names, rng.randrange(3))
+        depends += rng.sample(["base", "x"], rng.randrange(2))
+        return mock_addons_set({name: {"depends": depends}})[name]
+
+    addons_set = AddonsSet({name: random_addon(name) for name in names[:20]})
+    graph = DependencyGraph(addons_set, OdooSeries.v16_0)
+    for _ in range(100):
+        for _ in range(rng.randrange(1, 4)):
+            name = rng.choice(names)
+            if name in addons_set and rng.random() < 0.4:  # noqa: PLR2004
+                del addons_set[name]
+            else:
+                addons_set[name] = random_addon(name)
+        assert graph.version == addons_set.version
+        expected = DependencyGraph(addons_set, OdooSeries.v16_0)
+        assert set(graph) == set(expected)
+        assert graph.core_addons == expected.core_addons
+        assert graph.missing == expected.missing
+        # query part of the graph, so that some results are memoized
+        for name in rng.sample(sorted(expected), len(expected) // 2):
+            assert graph.depends(name) == expected.depends(name)
+            assert graph.dependents(name) == expected.dependents(name)
+            assert graph.all_depends(name) == expected.all_depends(name), name
+            assert graph.all_dependents(name) == expected.all_dependents(name), name
+        assert graph.impacted(["x"]) == expected.impacted(["x"])
+        assert graph.impacted(names) == expected.impacted(names)
+
+
+def test_incremental_new_addon_without_depends() -> None:
+    addons_set = mock_addons_set({"a": {"depends": ["base"]}})
+    graph = DependencyGraph(addons_set)
+    assert "b" not in graph
+    addons_set["b"] = mock_addons_set({"b": {}})["b"]
+    assert "b" in graph
+    assert graph.all_depends("b") == set()
+    assert graph.impacted(["b"]) == {"b"}
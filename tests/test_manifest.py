@@ -1,8 +1,17 @@
-from typing import Any, Tuple
+import pickle
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 import pytest
 
-from manifestoo_core.manifest import InvalidManifest, Manifest
+from manifestoo_core.manifest import (
+    CompactManifest,
+    CompiledManifest,
+    InvalidManifest,
+    Manifest,
+    ManifestParser,
+)
 
 
 @pytest.mark.parametrize(
@@ -22,9 +31,21 @@ from manifestoo_core.manifest import InvalidManifest, Manifest
         ("installable", False),
     ],
 )
-def test_manifest_valid_value(key: str, value: Any) -> None:
-    manifest = Manifest.from_dict({key: value})
-    assert getattr(manifest, key) == value
+@pytest.mark.parametrize(
+    "manifest_class", [Manifest, CompiledManifest, CompactManifest]
+)
+def test_manifest_valid_value(
+    key: str,
+    value: Any,
+    manifest_class: Type[Manifest],
+) -> None:
+    manifest = manifest_class.from_dict({key: value})
+    if manifest_class is Manifest or key != "external_dependencies":
+        assert getattr(manifest, key) == value
+    else:
+        # nested lists are frozen into tuples
+        assert getattr(manifest, key) == {"python": ("httpx",)}
+    assert manifest.manifest_dict[key] == value
 
 
 @pytest.mark.parametrize(
@@ -48,6 +69,12 @@ def test_manifest_invalid_value(key: str, value: Any) -> None:
     manifest = Manifest.from_dict({key: value})
     with pytest.raises(InvalidManifest):
         getattr(manifest, key)
+    with pytest.raises(InvalidManifest):
+        manifest.compile()
+    with pytest.raises(InvalidManifest):
+        CompiledManifest.from_dict({key: value})
+    with pytest.raises(InvalidManifest):
+        CompactManifest.from_dict({key: value})
 
 
 def test_manifest_non_str_keys() -> None:
@@ -55,9 +82,21 @@ def test_manifest_non_str_keys() -> None:
         Manifest.from_dict({"name": "the name", 1: "1"})
 
 
-def test_manifest_invalid_syntax() -> None:
+@pytest.mark.parametrize("parser", list(ManifestParser))
+def test_manifest_invalid_syntax(parser: ManifestParser) -> None:
     with pytest.raises(InvalidManifest):
-        Manifest.from_str('{"name": "the name", ...}')
+        Manifest.from_str('{"name": "the name", ...}', parser=parser)
+
+
+@pytest.mark.parametrize("parser", list(ManifestParser))
+def test_manifest_from_str(parser: ManifestParser) -> None:
+    manifest = Manifest.from_str(
+        "{'name': 'the name', 'depends': ['base'], 'installable': False}",
+        parser=parser,
+    )
+    assert manifest.name == "the name"
+    assert manifest.depends == ["base"]
+    assert manifest.installable is False
 
 
 @pytest.mark.parametrize(
@@ -73,11 +112,104 @@ def test_manifest_invalid_syntax() -> None:
         ("category", None),
     ],
 )
-def test_manifest_default_value(key: str, default: Any) -> None:
-    manifest = Manifest.from_dict({})
+@pytest.mark.parametrize(
+    "manifest_class", [Manifest, CompiledManifest, CompactManifest]
+)
+def test_manifest_default_value(
+    key: str,
+    default: Any,
+    manifest_class: Type[Manifest],
+) -> None:
+    manifest = manifest_class.from_dict({})
     assert getattr(manifest, key) == default
 
 
+def test_compiled_manifest() -> None:
+    manifest_dict = {
+        "name": "the name",
+        "author": "Alice, Bob",
+        "depends": ["base"],
+        "data": ["views.xml"],
+    }
+    manifest = Manifest.from_dict(manifest_dict).compile()
+    assert isinstance(manifest, Manifest)
+    assert manifest.name == "the name"
+    assert manifest.authors == ("Alice", "Bob")
+    assert manifest.depends == ["base"]
+    assert manifest.version is None
+    assert manifest.manifest_dict == manifest_dict
+    assert not hasattr(manifest, "__dict__")
+    with pytest.raises(AttributeError):
+        manifest.manifest_dict = {}  # type: ignore[misc]
+    with pytest.raises(AttributeError):
+        manifest._values = ()
+    unpickled = pickle.loads(pickle.dumps(manifest))  # noqa: S301
+    assert isinstance(unpickled, CompiledManifest)
+    assert unpickled.manifest_dict == manifest_dict
+
+
+@pytest.mark.parametrize("manifest_class", [CompiledManifest, CompactManifest])
+def test_compiled_manifest_copies(manifest_class: Type[CompiledManifest]) -> None:
+    manifest_dict: Dict[str, Any] = {
+        "depends": ["base"],
+        "external_dependencies": {"python": ["httpx"]},
+        "other": {"key": [1]},
+    }
+    manifest = manifest_class.from_dict(manifest_dict)
+    manifest_dict["depends"].append("mail")
+    manifest_dict["external_dependencies"]["python"].append("lxml")
+    manifest_dict["other"]["key"].append(2)
+    manifest.depends.append("web")
+    with pytest.raises(TypeError):
+        manifest.external_dependencies["bin"] = ["git"]
+    manifest.manifest_dict["depends"].append("web")
+    manifest.manifest_dict["external_dependencies"]["bin"] = ["git"]
+    manifest.manifest_dict["other"]["key"].append(3)
+    assert manifest.depends == ["base"]
+    assert manifest.external_dependencies == {"python": ("httpx",)}
+    assert manifest.manifest_dict == {
+        "depends": ["base"],
+        "external_dependencies": {"python": ["httpx"]},
+        "other": {"key": [1]},
+    }
+
+
+def test_compact_manifest() -> None:
+    manifest_dict = {
+        "name": "the name",
+        "description": "a long description",
+        "depends": ["base", "".join(["m", "ail"])],
+        "data": ["views.xml"],
+        "external_dependencies": {"python": ["httpx"]},
+        "other": [1],
+    }
+    manifest = CompactManifest.from_dict(manifest_dict)
+    assert manifest.name == "the name"
+    assert manifest.description is None
+    assert manifest.depends == ["base", "mail"]
+    assert manifest.depends[1] is "mail"  # noqa: F632
+    manifest.depends.append("web")
+    assert manifest.depends == ["base", "mail"]
+    assert manifest.external_dependencies == {"python": ("httpx",)}
+    assert manifest.manifest_dict == {
+        "name": "the name",
+        "depends": ["base", "mail"],
+        "external_dependencies": {"python": ["httpx"]},
+        "other": [1],
+    }
+    assert not hasattr(manifest, "__dict__")
+    unpickled = pickle.loads(pickle.dumps(manifest))  # noqa: S301
+    assert isinstance(unpickled, CompactManifest)
+    assert unpickled.manifest_dict == manifest.manifest_dict
+
+
+def test_compiled_manifest_from_str() -> None:
+    manifest = CompiledManifest.from_str("{'name': 'the name', 'other': 1}")
+    assert isinstance(manifest, CompiledManifest)
+    assert manifest.name == "the name"
+    assert manifest.manifest_dict["other"] == 1
+
+
 @pytest.mark.parametrize(
     "author,expected",
     [
@@ -97,3 +229,71 @@ def test_manifest_default_value(key: str, default: Any) -> None:
 def test_manifest_authors(author: str, expected: Tuple[str, ...]) -> None:
     manifest = Manifest.from_dict({"author": author} if author is not None else {})
     assert manifest.authors == expected
+
+
+@pytest.mark.parametrize("parser", list(ManifestParser))
+def test_manifest_from_str_keys(parser: ManifestParser) -> None:
+    manifest = Manifest.from_str(
+        "{'name': 'the name', 'description': '''long\\ntext''', 'depends': ['base']}",
+        parser=parser,
+        keys=("name", "depends", "version"),
+    )
+    assert manifest.manifest_dict == {"name": "the name", "depends": ["base"]}
+
+
+@pytest.mark.parametrize("parser", list(ManifestParser))
+def test_manifest_from_str_keys_invalid_syntax(parser: ManifestParser) -> None:
+    with pytest.raises(InvalidManifest):
+        Manifest.from_str("{'name': 'n', 'data': [1 2]}", parser=parser, keys=["name"])
+
+
+@pytest.mark.parametrize(
+    "executor_class", [None, ThreadPoolExecutor, ProcessPoolExecutor]
+)
+@pytest.mark.parametrize("manifest_class", [Manifest, CompiledManifest])
+def test_manifest_from_files(
+    tmp_path: Path,
+    executor_class: Optional[Callable[[], Executor]],
+    manifest_class: Type[Manifest],
+) -> None:
+    sources = {
+        "a": "{'name': 'A'}",
+        "b": "{'name': 'B', 'depends': ['a']}",
+        "syntax": "{'name':}",
+        "type": "{'name': 1}",
+        "list": "[]",
+        "literal": "{'name': foo}",
+    }
+    for name, source in sources.items():
+        (tmp_path / name).write_text(source)
+    (tmp_path / "encoding").write_bytes(b"{'name': '\xe9'}")
+    paths = [tmp_path / name for name in ("a", "syntax", "missing", "b", "type")]
+    paths.extend([tmp_path / "list", tmp_path / "a"] * 10)
+    paths.extend([tmp_path / "literal", tmp_path / "a", tmp_path / "encoding"])
+    if executor_class is None:
+        results = manifest_class.from_files(paths, keys=["name"])
+    else:
+        with executor_class() as executor:
+            results = manifest_class.from_files(
+                paths, executor, chunksize=3, keys=["name"]
+            )
+    assert len(results) == len(paths)
+    a, syntax, missing, b, type_, *others = results
+    assert isinstance(a, manifest_class)
+    assert a.manifest_dict == {"name": "A"}
+    assert isinstance(syntax, InvalidManifest)
+    assert isinstance(missing, FileNotFoundError)
+    assert isinstance(b, manifest_class)
+    assert b.manifest_dict == {"name": "B"}
+    if manifest_class is CompiledManifest:
+        assert isinstance(type_, InvalidManifest)
+    else:
+        assert isinstance(type_, Manifest)
+    *others, literal, a2, encoding = others
+    for invalid, valid in zip(others[::2], others[1::2]):
+        assert isinstance(invalid, InvalidManifest)
+        assert isinstance(valid, manifest_class)
+        assert valid.name == "A"
+    assert isinstance(literal, InvalidManifest)
+    assert isinstance(a2, manifest_class)
+    assert isinstance(encoding, InvalidManifest)
@@ -0,0 +1,124 @@
+import os
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import pytest
+
+from manifestoo_core import manifest_cache
+from manifestoo_core.addon import Addon
+from manifestoo_core.manifest import InvalidManifest, Manifest
+from manifestoo_core.manifest_cache import (
+    ManifestCache,
+    get_manifest_cache,
+    set_manifest_cache,
+    stat_signature,
+)
+from manifestoo_core.manifest_parser import parse_manifest_literal
+
+
+@pytest.fixture
+def parsed(monkeypatch: pytest.MonkeyPatch) -> List[str]:
+    """Record the sources parsed by the cache."""
+    sources: List[str] = []
+    parse = parse_manifest_literal
+
+    def recording_parse(source: str, *args: Any) -> Any:
+        sources.append(source)
+        return parse(source, *args)
+
+    monkeypatch.setattr(manifest_cache, "parse_manifest_literal", recording_parse)
+    return sources
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Iterator[ManifestCache]:
+    with ManifestCache(tmp_path / "cache.sqlite") as cache:
+        set_manifest_cache(cache)
+        try:
+            yield cache
+        finally:
+            set_manifest_cache(None)
+
+
+def test_stat_signature(tmp_path: Path) -> None:
+    assert stat_signature(tmp_path / "missing") is None
+    path = tmp_path / "file"
+    path.write_text("abc")
+    signature = stat_signature(path)
+    assert signature is not None
+    assert signature[1] == 3  # noqa: PLR2004
+
+
+def test_load(tmp_path: Path, cache: ManifestCache, parsed: List[str]) -> None:
+    manifest_path = tmp_path / "__manifest__.py"
+    manifest_path.write_text("{'name': 'a'}")
+    assert cache.load(manifest_path) == {"name": "a"}
+    assert cache.load(manifest_path) == {"name": "a"}
+    assert len(parsed) == 1
+    # a new cache on the same database has the entry
+    with ManifestCache(cache.path) as other_cache:
+        assert other_cache.load(manifest_path) == {"name": "a"}
+    assert len(parsed) == 1
+
+
+def test_load_modified(tmp_path: Path, cache: ManifestCache, parsed: List[str]) -> None:
+    manifest_path = tmp_path / "__manifest__.py"
+    manifest_path.write_text("{'name': 'a'}")
+    assert cache.load(manifest_path) == {"name": "a"}
+    manifest_path.write_text("{'name': 'bb'}")
+    assert cache.load(manifest_path) == {"name": "bb"}
+    assert len(parsed) == 2  # noqa: PLR2004
+
+
+def test_load_touched(tmp_path: Path, cache: ManifestCache, parsed: List[str]) -> None:
+    manifest_path = tmp_path / "__manifest__.py"
+    manifest_path.write_text("{'name': 'a'}")
+    assert cache.load(manifest_path) == {"name": "a"}
+    st = manifest_path.stat()
+    os.utime(manifest_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert cache.load(manifest_path) == {"name": "a"}
+    assert cache.load(manifest_path) == {"name": "a"}
+    assert len(parsed) == 1
+
+
+def test_eviction(tmp_path: Path) -> None:
+    with ManifestCache(tmp_path / "cache.sqlite", max_entries=5) as cache:
+        for i in range(20):
+            manifest_path = tmp_path / f"{i}.py"
+            manifest_path.write_text(f"{{'name': '{i}'}}")
+            assert cache.load(manifest_path) == {"name": str(i)}
+    with ManifestCache(tmp_path / "cache.sqlite") as cache:
+        (count,) = cache._connect().execute("SELECT COUNT(*) FROM manifests").fetchone()
+    assert count == 5  # noqa: PLR2004
+
+
+def test_clear(tmp_path: Path, cache: ManifestCache, parsed: List[str]) -> None:
+    manifest_path = tmp_path / "__manifest__.py"
+    manifest_path.write_text("{'name': 'a'}")
+    cache.load(manifest_path)
+    cache.clear()
+    cache.load(manifest_path)
+    assert len(parsed) == 2  # noqa: PLR2004
+
+
+def test_from_addon_dir(
+    tmp_path: Path,
+    cache: ManifestCache,
+    parsed: List[str],
+) -> None:
+    assert get_manifest_cache() is cache
+    addon_dir = tmp_path / "a"
+    addon_dir.mkdir()
+    addon_dir.joinpath("__init__.py").touch()
+    addon_dir.joinpath("__manifest__.py").write_text("{'name': 'A', 'version': '1'}")
+    assert Addon.from_addon_dir(addon_dir).manifest.name == "A"
+    addon = Addon.from_addon_dir(addon_dir, manifest_keys=["version"])
+    assert addon.manifest.manifest_dict == {"version": "1"}
+    assert len(parsed) == 1
+
+
+def test_invalid_syntax(tmp_path: Path, cache: ManifestCache) -> None:
+    manifest_path = tmp_path / "__manifest__.py"
+    manifest_path.write_text("{'name':}")
+    with pytest.raises(InvalidManifest):
+        Manifest.from_file(manifest_path)
@@ -0,0 +1,103 @@
+import ast
+from typing import Any
+
+import pytest
+
+from manifestoo_core.manifest_parser import ManifestParser, parse_manifest_literal
+
+VALID_SOURCES = [
+    "{}",
+    "{}\n",
+    "# comment\n{} # comment\n",
+    "{'name': 'a', 'version': '16.0.1.0.0', 'depends': ['base', 'mail'],}",
+    '{"installable": True, "auto_install": False, "images": None}',
+    "{'a': (), 'b': (1,), 'c': (1), 'd': (1, 2,), 'e': [[], {}]}",
+    "{'n': 10, 'f': 1.5, 'e': 1e-3, 'neg': -1, 'pos': + 2, 'x': 0x10, 'u': 1_000}",
+    "{'c': 1j, 'o': 0o7, 'z': 0, 'dot': .5}",
+    "{'s': 'a' \"b\"\n 'c', 't': ('x'\n 'y')}",
+    "{'d': '''multi\nline 'quoted' \"\"\" string'''}",
+    '{"d": """multi\nline "quoted" string"""}',
+    r"{'e': 'tab\there', 'n': '\n', 'q': '\'', 'u': 'é'}",
+    "{'u': u'unicode', 'r': r'raw\\d', 'b': b'bytes', 'rb': rb'\\x'}",
+    "{'é': 'ünïcode'}",
+    "{'a': 'line\\\ncontinuation'}",
+    "{'a': '''crlf\r\nin triple quotes'''}",
+    "  {}",
+    "\f{}",
+    "[1, 2]",
+    "'just a string'",
+    "{1: 'one', 1.0: 'one again', None: 0, (1, 2): 'tuple key'}",
+    "{'a': 1, 'a': 2}",
+    # handled by the ast.literal_eval fallback
+    "{'a': set(), 'b': {1, 2}}",
+    "{'a': 1 + 2j}",
+]
+
+INVALID_SOURCES = [
+    "",
+    "{",
+    "{'installable':}",
+    '{"name": "the name", ...}',
+    "{'a': 1 'b': 2}",
+    "{'a': [1 2]}",
+    "{'a' 1}",
+    "{'a': foo}",
+    "{'a': f'x'}",
+    "{'a': 'b' b'c'}",
+    "{'a': - - 1}",
+    "{'a': -True}",
+    "{'a': 1 + 2}",
+    "{'a': 1 - 2}",
+    "{'a': 01}",
+    "{'a': 'unterminated}",
+    "{'a': 'x\ny'}",
+    "{[]: 1}",
+    "{**{}}",
+    "\n {}",
+    "# comment\n  {}",
+    "{}\n  ",
+    "'a'\n'b'",
+    "{}\\\n",
+    "{} {}",
+    "﻿{}",
+    "{'a': 'null\0byte'}",
+]
+
+
+def _evaluate(source: str, parser: ManifestParser) -> Any:
+    try:
+        return parse_manifest_literal(source, parser)
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("source", VALID_SOURCES)
+def test_fast_parser_valid(source: str) -> None:
+    expected = ast.literal_eval(source)
+    result = parse_manifest_literal(source, ManifestParser.FAST)
+    assert result == expected
+    assert type(result) is type(expected)
+    assert repr(result) == repr(expected)
+
+
+@pytest.mark.parametrize("source", INVALID_SOURCES)
+def test_fast_parser_invalid(source: str) -> None:
+    expected = _evaluate(source, ManifestParser.AST)
+    assert isinstance(expected, type)
+    assert _evaluate(source, ManifestParser.FAST) is expected
+
+
+def test_fast_parser_large_description() -> None:
+    description = "Lorem ipsum 'dolor' sit amet.\n" * 10000
+    source = repr({"name": "a", "description": description, "depends": ["base"]})
+    assert parse_manifest_literal(source) == ast.literal_eval(source)
+
+
+@pytest.mark.parametrize(
+    "source",
+    ["{'a': b'\xe9', 'version': '1'}", "{'a': rb'x\xe9', 'version': '1'}"],
+)
+@pytest.mark.parametrize("parser", list(ManifestParser))
+def test_skipped_value_non_ascii_bytes(source: str, parser: ManifestParser) -> None:
+    with pytest.raises(SyntaxError):
+        parse_manifest_literal(source, parser, keys={"version"})
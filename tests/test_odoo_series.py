@@ -1,13 +1,19 @@
+from pathlib import Path
+from unittest import mock
+
 import pytest
 
+from manifestoo_core.addon import Addon
+from manifestoo_core.addons_set import AddonsSet
 from manifestoo_core.exceptions import UnsupportedOdooSeries
 from manifestoo_core.odoo_series import (
     OdooSeries,
     detect_from_addon_version,
+    detect_from_addons_dirs,
     detect_from_addons_set,
 )
 
-from .common import mock_addons_set
+from .common import mock_addons_set, populate_addons_dir
 
 
 def test_detect_from_version() -> None:
@@ -49,6 +55,67 @@ def test_detect_ambiguous() -> None:
     assert detect_from_addons_set(addons_set) == {OdooSeries.v12_0, OdooSeries.v13_0}
 
 
+def test_detect_from_addons_dirs(tmp_path: Path) -> None:
+    populate_addons_dir(
+        tmp_path / "dir1",
+        {
+            "a": {"version": "16.0.1.0.0"},
+            "b": {"version": "16.0.1.0.1"},
+            "c": {"version": "1.0"},
+            "d": {},
+            "e": {"version": "15.0.1.0.0", "installable": False},
+        },
+    )
+    populate_addons_dir(tmp_path / "dir2", {"f": {"version": "15.0.1.0.0"}})
+    addons_dirs = [tmp_path / "dir1", tmp_path / "dir2"]
+    assert detect_from_addons_dirs(addons_dirs) == {
+        OdooSeries.v16_0: 2,
+        OdooSeries.v15_0: 1,
+    }
+    assert detect_from_addons_dirs([]) == {}
+    # inconsistent votes do not stop the detection
+    assert detect_from_addons_dirs(reversed(addons_dirs), stop_after=2) == {
+        OdooSeries.v16_0: 2,
+        OdooSeries.v15_0: 1,
+    }
+
+
+def test_detect_from_addons_dirs_duplicates(tmp_path: Path) -> None:
+    populate_addons_dir(
+        tmp_path / "dir1",
+        {
+            "a": {"version": "16.0.1.0.0"},
+            "b": {"version": "16.0.1.0.0"},
+            "c": {"version": "16.0.1.0.0"},
+        },
+    )
+    populate_addons_dir(
+        tmp_path / "dir2",
+        {"a": {"version": "16.0.1.0.1"}, "b": {"version": "17.0.1.0.0"}, "c": {}},
+    )
+    addons_dirs = [tmp_path / "dir1", tmp_path / "dir2"]
+    addons_set = AddonsSet()
+    addons_set.add_from_addons_dirs(addons_dirs)
+    counts = detect_from_addons_dirs(addons_dirs)
+    assert counts == {OdooSeries.v16_0: 1, OdooSeries.v17_0: 1}
+    assert set(counts) == detect_from_addons_set(addons_set)
+
+
+def test_detect_from_addons_dirs_stop_after(tmp_path: Path) -> None:
+    populate_addons_dir(
+        tmp_path, {f"a{i}": {"version": "17.0.1.0.0"} for i in range(10)}
+    )
+    with mock.patch(
+        "manifestoo_core.addons_set.Addon.from_addon_dir",
+        side_effect=Addon.from_addon_dir,
+    ) as from_addon_dir:
+        assert detect_from_addons_dirs([tmp_path], stop_after=3) == {
+            OdooSeries.v17_0: 3
+        }
+    assert from_addon_dir.call_count == 3  # noqa: PLR2004
+    assert detect_from_addons_dirs([tmp_path], stop_after=20) == {OdooSeries.v17_0: 10}
+
+
 def test_series_from_str() -> None:
     assert OdooSeries.from_str("10.0") == OdooSeries.v10_0
 
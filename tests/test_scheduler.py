@@ -0,0 +1,114 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import pytest
+
+from manifestoo_core.addon import Addon
+from manifestoo_core.exceptions import DependencyCycle
+from manifestoo_core.scheduler import run_in_dependency_order, topological_levels
+
+from .common import mock_addons_set
+
+ADDONS = {
+    "a": {"depends": ["b", "c", "base"]},
+    "b": {"depends": ["d"]},
+    "c": {"depends": ["d"]},
+    "d": {},
+    "e": {"depends": ["a"]},
+    "f": {},
+}
+
+
+def test_topological_levels() -> None:
+    assert topological_levels(mock_addons_set(ADDONS)) == [
+        ["d", "f"],
+        ["b", "c"],
+        ["a"],
+        ["e"],
+    ]
+    assert topological_levels(mock_addons_set({})) == []
+
+
+def test_cycles() -> None:
+    addons_set = mock_addons_set(
+        {
+            **ADDONS,
+            "x": {"depends": ["y"]},
+            "y": {"depends": ["x", "a"]},
+            "z": {"depends": ["z"]},
+        }
+    )
+    with pytest.raises(DependencyCycle) as e:
+        topological_levels(addons_set)
+    assert e.value.cycles == [["x", "y"], ["z"]]
+    assert "x, y; z" in str(e.value)
+    called: List[Addon] = []
+    with pytest.raises(DependencyCycle):
+        run_in_dependency_order(addons_set, called.append)
+    assert not called
+
+
+def test_run_in_dependency_order() -> None:
+    lock = threading.Lock()
+    done: List[str] = []
+    addons_set = mock_addons_set(ADDONS)
+
+    def func(addon: Addon) -> str:
+        name = addon.name
+        with lock:
+            assert all(d in done for d in addon.manifest.depends if d in addons_set), (
+                name
+            )
+            done.append(name)
+        return name.upper()
+
+    result = run_in_dependency_order(addons_set, func, workers=4)
+    assert result.results == {name: name.upper() for name in ADDONS}
+    assert not result.errors
+    assert not result.skipped
+    assert sorted(done) == sorted(ADDONS)
+
+
+def test_start_when_dependencies_done() -> None:
+    # "slow" is on the first level, and only finishes when "b", of the second
+    # level, has run.
+    addons_set = mock_addons_set({"slow": {}, "a": {}, "b": {"depends": ["a"]}})
+    b_done = threading.Event()
+
+    def func(addon: Addon) -> None:
+        name = addon.name
+        if name == "slow":
+            assert b_done.wait(timeout=10)
+        elif name == "b":
+            b_done.set()
+
+    result = run_in_dependency_order(addons_set, func, workers=2)
+    assert not result.errors
+
+
+def test_failures() -> None:
+    addons_set = mock_addons_set(ADDONS)
+
+    def func(addon: Addon) -> None:
+        if addon.name == "b":
+            msg = "b failed"
+            raise RuntimeError(msg)
+
+    result = run_in_dependency_order(addons_set, func, workers=2)
+    assert set(result.results) == {"c", "d", "f"}
+    assert set(result.errors) == {"b"}
+    assert str(result.errors["b"]) == "b failed"
+    assert result.skipped == {"a": "b", "e": "b"}
+
+
+def _addon_dir_name(addon: Addon) -> str:
+    return addon.name
+
+
+def test_process_pool() -> None:
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = run_in_dependency_order(
+            mock_addons_set(ADDONS), _addon_dir_name, executor=executor
+        )
+    assert result.results == {name: name for name in ADDONS}